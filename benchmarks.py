@@ -0,0 +1,349 @@
+"""Benchmarks for the wireframe builders, serialization and page assembly
+
+    python benchmarks.py --output before.json
+    python benchmarks.py --compare before.json
+
+Times every create_* builder and tostring() separately for each backend,
+the memory a board of 500 built screens keeps per backend, the whole
+main() page with Streamlit replaced by a recording stub, a load test of
+the HTTP server (requests_per_s) and interpreter startup up to the first
+rendered screen, so it runs headless. Each case reports wall time,
+tracemalloc peak and output size; --output saves them as JSON for
+comparing commits.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import svglofi
+
+
+def measure(func, repeat):
+    """Return (median ms, min ms, tracemalloc peak bytes, result) for func"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        result = func()
+        times.append((time.perf_counter_ns() - start) / 1e6)
+    # Traced separately, tracemalloc slows the timed runs down a lot
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), min(times), peak, result
+
+
+def record(results, name, func, repeat, size=None):
+    median, best, peak, result = measure(func, repeat)
+    if size is None and isinstance(result, str):
+        size = len(result.encode())
+    results[name] = {
+        'median_ms': round(median, 4),
+        'min_ms': round(best, 4),
+        'peak_bytes': peak,
+        'size_bytes': size
+    }
+    return result
+
+
+def bench_screens(results, backend, repeat):
+    wireframes = svglofi.AthleteAppWireframes(backend=backend)
+    for name, method in wireframes.SCREENS.items():
+        builder = getattr(wireframes, method)
+        record(results, f'{backend}/{name}/build', builder, repeat)
+        dwg = builder()
+        record(results, f'{backend}/{name}/tostring', dwg.tostring, repeat)
+
+
+class StubStreamlit:
+    """Stands in for streamlit and streamlit.components.v1 in main()
+
+    Widgets return their defaults, containers work as context managers
+    and every call is counted along with the bytes of content sent.
+    """
+    query_params = {}
+
+    def __init__(self):
+        self.calls = 0
+        self.sent_bytes = 0
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls += 1
+            for arg in args:
+                if isinstance(arg, str):
+                    self.sent_bytes += len(arg.encode())
+            if name in ('cache_resource', 'cache_data', 'fragment', 'experimental_fragment'):
+                return args[0] if args else (lambda func: func)
+            if name == 'columns':
+                spec = args[0]
+                return [self] * (spec if isinstance(spec, int) else len(spec))
+            if name in ('radio', 'selectbox'):
+                return list(args[1])[kwargs.get('index', 0)]
+            if name == 'slider':
+                return args[3] if len(args) > 3 else kwargs.get('value', args[1])
+            if name in ('checkbox', 'toggle'):
+                return kwargs.get('value', False)
+            return self
+        return call
+
+    @property
+    def sidebar(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def bench_board(results, backend, copies=50):
+    """Memory still held by a board of built screens; size_bytes is per screen"""
+    wireframes = svglofi.AthleteAppWireframes(backend=backend)
+    for name in wireframes.SPECS:
+        wireframes.build_screen(name)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter_ns()
+    board = [wireframes.build_screen(name) for _ in range(copies) for name in wireframes.SPECS]
+    elapsed = (time.perf_counter_ns() - start) / 1e6
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[f'{backend}/board/{len(board)}'] = {
+        'median_ms': round(elapsed, 4),
+        'min_ms': round(elapsed, 4),
+        'peak_bytes': peak,
+        'size_bytes': round(retained / len(board))
+    }
+
+
+def bench_page(results, repeat):
+    """main() with Streamlit stubbed, from a cold and from a warm cache"""
+    real = svglofi.st, svglofi.components
+    stub = StubStreamlit()
+    svglofi.st = svglofi.components = stub
+    try:
+        def cold():
+            svglofi.render_cache.clear()
+            svglofi.main()
+
+        for name, func in (('cold', cold), ('warm', svglofi.main)):
+            func()
+            stub.calls = stub.sent_bytes = 0
+            func()
+            calls, sent = stub.calls, stub.sent_bytes
+            record(results, f'page/main/{name}', func, repeat, size=sent)
+            results[f'page/main/{name}']['streamlit_calls'] = calls
+    finally:
+        svglofi.st, svglofi.components = real
+
+    # The whole journey as the single batched document
+    wireframes = svglofi.AthleteAppWireframes(backend='string', symbols=True, css_vars=True)
+
+    def journey():
+        svglofi.render_cache.clear()
+        return svglofi.journey_document(wireframes)
+
+    record(results, 'page/journey_document/cold', journey, repeat)
+
+    def prototype():
+        svglofi.render_cache.clear()
+        return svglofi.prototype_document(wireframes)
+
+    record(results, 'page/prototype_document/cold', prototype, repeat)
+
+
+def bench_variants(results, repeat):
+    """Every screen at every export device size: one batch vs size by size"""
+    def per_size():
+        for width, height in svglofi.DEVICES.values():
+            wireframes = svglofi.AthleteAppWireframes(
+                backend='string', screen_width=width, screen_height=height
+            )
+            for name in wireframes.SPECS:
+                wireframes.build_screen(name).tostring()
+
+    record(results, 'variants/per_size', per_size, repeat)
+    record(results, 'variants/batch', svglofi.render_variants, repeat)
+
+
+def bench_minify(results, repeat):
+    """minify_svg() per screen; size_bytes is the minified size"""
+    wireframes = svglofi.AthleteAppWireframes(backend='string')
+    for name in wireframes.SPECS:
+        svg = wireframes.render(name)
+        record(results, f'minify/{name}', lambda: svglofi.minify_svg(svg), repeat)
+
+
+def bench_server(results, repeat, clients=8):
+    """Load test of the HTTP server: requests/sec over keep-alive clients
+
+    Every client cycles through the screens on its own connection, first
+    fetching gzipped bodies, then revalidating them with If-None-Match.
+    """
+    import http.client
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    server = svglofi.make_server(port=0, workers=clients, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    paths = [f'/screens/{name}.svg' for name in svglofi.AthleteAppWireframes.SPECS]
+    etags = {}
+    try:
+        for case, status in (('200', 200), ('304', 304)):
+            def client(count):
+                connection = http.client.HTTPConnection('127.0.0.1', port)
+                times, sizes = [], []
+                for k in range(count):
+                    path = paths[k % len(paths)]
+                    headers = {'Accept-Encoding': 'gzip'}
+                    if status == 304:
+                        headers['If-None-Match'] = etags[path]
+                    start = time.perf_counter_ns()
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    times.append((time.perf_counter_ns() - start) / 1e6)
+                    if response.status != status:
+                        raise RuntimeError(f'{path}: {response.status}, expected {status}')
+                    etags[path] = response.getheader('ETag')
+                    sizes.append(len(body))
+                connection.close()
+                return times, sizes
+
+            count = max(len(paths), repeat * 10)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(clients) as pool:
+                runs = list(pool.map(client, [count] * clients))
+            elapsed = time.perf_counter() - start
+            times = [t for run, _ in runs for t in run]
+            sizes = [s for _, run in runs for s in run]
+            results[f'server/{case}'] = {
+                'median_ms': round(statistics.median(times), 4),
+                'min_ms': round(min(times), 4),
+                'peak_bytes': None,
+                'size_bytes': round(statistics.mean(sizes)),
+                'requests_per_s': round(len(times) / elapsed)
+            }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_startup(results, repeat):
+    """Fresh interpreter: import the engine, then import and render one screen"""
+    # Run next to svglofi.py so the import works from any directory
+    cwd = os.path.dirname(os.path.abspath(svglofi.__file__))
+    cases = {
+        'startup/import': 'import svglofi',
+        'startup/first_render': "import svglofi; svglofi.AthleteAppWireframes(backend='string').render('welcome')"
+    }
+    for name, code in cases.items():
+        times = []
+        for _ in range(max(3, repeat // 4)):
+            start = time.perf_counter_ns()
+            subprocess.run([sys.executable, '-c', code], check=True, cwd=cwd)
+            times.append((time.perf_counter_ns() - start) / 1e6)
+        results[name] = {
+            'median_ms': round(statistics.median(times), 4),
+            'min_ms': round(min(times), 4),
+            'peak_bytes': None,
+            'size_bytes': None
+        }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(repeat, backends):
+    """Run every benchmark; one that fails is reported and the rest still run"""
+    results = {}
+    failures = {}
+    benches = []
+    for backend in backends:
+        benches.append((f'screens/{backend}', bench_screens, (backend, repeat)))
+        benches.append((f'board/{backend}', bench_board, (backend,)))
+    benches += [
+        ('page', bench_page, (repeat,)),
+        ('variants', bench_variants, (repeat,)),
+        ('minify', bench_minify, (repeat,)),
+        ('server', bench_server, (repeat,)),
+        ('startup', bench_startup, (repeat,))
+    ]
+    for name, bench, args in benches:
+        try:
+            bench(results, *args)
+        except Exception as exc:
+            failures[name] = f'{type(exc).__name__}: {exc}'
+            print(f'{name} failed: {failures[name]}', file=sys.stderr)
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'failures': failures
+        },
+        'results': results
+    }
+
+
+def print_table(report, baseline=None, threshold=0.1):
+    """Print results, with ratios against baseline when given"""
+    old = baseline['results'] if baseline else {}
+    print(f"{'case':48} {'median ms':>10} {'peak KB':>9} {'bytes':>8}" + ('  vs baseline' if old else ''))
+    regressions = 0
+    for name, row in report['results'].items():
+        line = f"{name:48} {row['median_ms']:10.3f} {(row['peak_bytes'] or 0) / 1024:9.1f} {row['size_bytes'] or 0:8}"
+        if name in old and old[name]['median_ms']:
+            ratio = row['median_ms'] / old[name]['median_ms']
+            flag = '  REGRESSION' if ratio > 1 + threshold else ''
+            regressions += bool(flag)
+            line += f'  {ratio:5.2f}x{flag}'
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per case')
+    parser.add_argument('--backend', action='append', choices=sorted(svglofi.BACKENDS),
+                        help='backend(s) to time (default: all)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown ratio above 1 reported as a regression (default 0.1)')
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, args.backend or sorted(svglofi.BACKENDS))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_table(report, baseline, args.threshold)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if regressions or report['meta']['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
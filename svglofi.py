@@ -1,766 +1,2853 @@
-import streamlit as st
-import svgwrite
+import argparse
+import ast
+import functools
+import hashlib
+import html
+import json
+import math
+import operator
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Streamlit is imported by load_streamlit() and svgwrite by its backend,
+# so using the wireframe engine as a library costs neither import
+st = components = None
+
+
+def load_streamlit():
+    """Import Streamlit on first use and return it"""
+    global st, components
+    if st is None:
+        import streamlit as st
+        import streamlit.components.v1 as components
+    return st
+
+
+# Bump when output changes for reasons the source digest can't see
+RENDERER_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint():
+    """Digest of this module's source; changes whenever the builders do"""
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and a rename"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Name of a DiskCache directory: renderer version and source digest
+DISK_CACHE_DIR = re.compile(r'v\d+-[0-9a-f]{16}')
+
+
+class DiskCache:
+    """Content-addressed store of rendered markup on disk
+
+    Files are named by a digest of the render key and live in a
+    directory per renderer version and module source digest, so editing
+    a builder invalidates everything it made. Directories left by other
+    code versions are removed when the cache is opened. The cache keeps
+    at most max_entries files and evicts the oldest first.
+    """
+    def __init__(self, directory, max_entries=2048):
+        self.root = directory
+        self.max_entries = max_entries
+        self.directory = os.path.join(
+            directory, f'v{RENDERER_VERSION}-{source_fingerprint()[:16]}'
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_stale()
+        # Filename -> mtime, read once so puts don't rescan the directory
+        self._index = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.svg'):
+                    self._index[entry.name] = entry.stat().st_mtime
+
+    def _remove_stale(self):
+        # Only directories and files this cache writes, the root may be shared
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.path != self.directory and DISK_CACHE_DIR.fullmatch(entry.name):
+                for child in os.scandir(entry.path):
+                    if not (child.name.endswith('.svg') or child.name.startswith('.tmp-')):
+                        continue
+                    try:
+                        os.unlink(child.path)
+                    except OSError:
+                        pass
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def filename(key):
+        return hashlib.sha256(repr(key).encode()).hexdigest() + '.svg'
+
+    def get(self, key):
+        """Return the stored markup for key, or None"""
+        try:
+            with open(os.path.join(self.directory, self.filename(key)), encoding='utf-8') as f:
+                value = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        name = self.filename(key)
+        write_atomic(os.path.join(self.directory, name), value.encode('utf-8'))
+        with self._lock:
+            self._index[name] = time.time()
+            excess = len(self._index) - self.max_entries
+            oldest = sorted(self._index, key=self._index.get)[:excess] if excess > 0 else []
+            for stale in oldest:
+                del self._index[stale]
+        for stale in oldest:
+            try:
+                os.unlink(os.path.join(self.directory, stale))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._index),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+class RenderCache:
+    """Bounded LRU cache of serialized screens, shared by every session
+
+    With a DiskCache attached as disk, memory misses are looked up there
+    before rendering and new renders are written through to it.
+    """
+    def __init__(self, maxsize=256, disk=None):
+        self.maxsize = maxsize
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether key is cached, without counting it as a lookup"""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        """Return the cached value for key (or None) and count the hit/miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, key, render):
+        """Return the cached value for key, calling render() on a miss"""
+        value = self.get(key)
+        if value is None:
+            if self.disk is not None:
+                value = self.disk.get(key)
+            if value is None:
+                # Built outside the lock so one slow screen doesn't block the rest
+                value = render()
+                if self.disk is not None:
+                    self.disk.put(key, value)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Process-wide: Streamlit reruns and concurrent sessions all share it
+render_cache = RenderCache()
+
+
+class RenderStats:
+    """Per-screen build timings by phase, element counts and output size
+
+    Screens are built from compiled plans, so the frame and nav bar are
+    only drawn while a plan is compiled: 'base' and 'nav' are compile
+    timings, counted once per configuration rather than per build.
+    """
+    PHASES = ('build', 'base', 'nav', 'serialize')
 
-class AthleteAppWireframes:
     def __init__(self):
-        self.screen_width = 360
-        self.screen_height = 640
-        self.padding = 20
-        
-        # Colors from journey map
-        self.colors = {
-            'background': '#FFFFFF',
-            'text': '#000000',
-            'primary': '#007AFF',
-            'secondary': '#666666',
-            'border': '#C5C5C7',
-            'surface': '#F5F5F5'
-        }
+        self.enabled = True
+        self._screens = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
 
-    def create_base_screen(self, name):
-        """Create base screen with iPhone frame"""
-        dwg = svgwrite.Drawing(size=(self.screen_width, self.screen_height))
-        
-        # Phone frame
-        dwg.add(dwg.rect(
-            (0, 0),
-            (self.screen_width, self.screen_height),
-            rx=40, ry=40,
-            fill=self.colors['background'],
-            stroke=self.colors['border'],
-            stroke_width=2
-        ))
-        
-        # Status bar
-        dwg.add(dwg.rect(
-            (0, 0),
-            (self.screen_width, 44),
-            fill=self.colors['surface']
-        ))
-        
-        # Notch
-        dwg.add(dwg.rect(
-            (self.screen_width/2 - 60, 0),
-            (120, 30),
-            rx=15, ry=15,
-            fill='#333333'
-        ))
-        
-        return dwg
+    @property
+    def current_screen(self):
+        """Screen whose builder is running on this thread"""
+        return getattr(self._local, 'screen', None)
 
-    def add_nav_bar(self, dwg, title, show_back=True):
-        """Add navigation bar to screen"""
-        # Nav bar background
-        dwg.add(dwg.rect(
-            (0, 44),
-            (self.screen_width, 44),
-            fill=self.colors['background']
-        ))
-        
-        # Back button if needed
-        if show_back:
-            dwg.add(dwg.path(
-                d=f'M 20,66 L 35,58 L 35,74 Z',
-                fill=self.colors['primary']
-            ))
-        
-        # Title
-        dwg.add(dwg.text(
-            title,
-            insert=(self.screen_width/2, 74),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
+    def record(self, screen, phase, ms):
+        if screen is None:
+            # Helpers called outside any screen's build
+            return
+        with self._lock:
+            entry = self._screens.setdefault(screen, {})
+            count, total, _ = entry.get(phase, (0, 0.0, 0.0))
+            entry[phase] = (count + 1, total + ms, ms)
 
-    def create_verification_welcome(self):
-        """Create verification welcome screen"""
-        dwg = self.create_base_screen("welcome")
-        self.add_nav_bar(dwg, "Welcome", show_back=False)
-        
-        # App logo
-        dwg.add(dwg.circle(
-            (self.screen_width/2, 180),
-            50,
-            fill=self.colors['primary']
-        ))
-        
-        # Welcome text
-        dwg.add(dwg.text(
-            "Athlete Verification",
-            insert=(self.screen_width/2, 280),
-            text_anchor='middle',
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 24px; font-weight: 600'
-        ))
-        
-        # Description
-        dwg.add(dwg.text(
-            "Verify your professional status",
-            insert=(self.screen_width/2, 320),
-            text_anchor='middle',
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 16px'
-        ))
-        
-        # Start button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 180),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Start Verification",
-            insert=(self.screen_width/2, self.screen_height - 145),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        return dwg
+    def record_output(self, screen, svg):
+        # Start tags, leaving out closing tags and the CDATA of <style>
+        elements = svg.count('<') - svg.count('</') - svg.count('<![CDATA[')
+        with self._lock:
+            entry = self._screens.setdefault(screen, {})
+            entry['elements'] = elements
+            entry['bytes'] = len(svg.encode())
 
-    def create_document_upload_screen(self):
-        """Create document upload screen"""
-        dwg = self.create_base_screen("document_upload")
-        self.add_nav_bar(dwg, "Document Upload")
-        
-        # Instructions
-        y = 108
-        dwg.add(dwg.text(
-            "Upload Required Documents",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Upload areas
-        documents = [
-            "League ID",
-            "Team Contract",
-            "Photo ID"
+    def record_overflows(self, screen, overflows):
+        with self._lock:
+            self._screens.setdefault(screen, {})['overflows'] = list(overflows)
+
+    def overflows(self):
+        """Screen -> text found too wide for it, for screens that have any"""
+        with self._lock:
+            return {
+                screen: entry['overflows']
+                for screen, entry in sorted(self._screens.items(), key=lambda kv: str(kv[0]))
+                if entry.get('overflows')
+            }
+
+    def rows(self):
+        """One dict per screen: build count, average ms per phase, size"""
+        with self._lock:
+            rows = []
+            for screen, entry in sorted(self._screens.items(), key=lambda kv: str(kv[0])):
+                row = {'screen': screen, 'builds': entry.get('build', (0,))[0]}
+                for phase in self.PHASES:
+                    count, total, _ = entry.get(phase, (0, 0.0, 0.0))
+                    row[f'{phase}_ms'] = round(total / count, 3) if count else None
+                row['elements'] = entry.get('elements')
+                row['bytes'] = entry.get('bytes')
+                row['overflows'] = len(entry.get('overflows', ()))
+                rows.append(row)
+            return rows
+
+    def clear(self):
+        with self._lock:
+            self._screens.clear()
+
+
+render_stats = RenderStats()
+
+
+def instrumented(phase):
+    """Record a wireframe method's wall time under phase in render_stats
+
+    A 'build' method marks its screen as current for the calls it makes,
+    so the 'base' and 'nav' helpers are charged to the right screen.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not render_stats.enabled:
+                return method(self, *args, **kwargs)
+            local = render_stats._local
+            outer = render_stats.current_screen
+            screen = outer
+            if phase == 'build':
+                screen = self.screen_for(method.__name__)
+                local.screen = screen
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                render_stats.record(screen, phase, (time.perf_counter() - start) * 1000)
+                local.screen = outer
+        return wrapper
+    return decorate
+
+
+SVG_NAMESPACES = (
+    ' xmlns="http://www.w3.org/2000/svg"'
+    ' xmlns:ev="http://www.w3.org/2001/xml-events"'
+    ' xmlns:xlink="http://www.w3.org/1999/xlink"'
+)
+
+
+def _escape_text(value):
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _escape_attr(value):
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '\r' in value or '\n' in value or '\t' in value:
+        value = value.replace('\r', '&#13;').replace('\n', '&#10;').replace('\t', '&#09;')
+    return value
+
+
+def _svg_element(tag, attribs, text=None):
+    """Serialize one element the way svgwrite + ElementTree would"""
+    parts = ['<', tag]
+    for name, value in sorted(attribs.items()):
+        if value is None:
+            continue
+        value = str(value)
+        if value:
+            parts.append(f' {name}="{_escape_attr(value)}"')
+    if text:
+        parts.append(f'>{_escape_text(text)}</{tag}>')
+    else:
+        parts.append(' />')
+    return ''.join(parts)
+
+
+def _svg_attribs(extra):
+    """Map svgwrite-style keyword arguments to SVG attribute names"""
+    return {name.rstrip('_').replace('_', '-'): value for name, value in extra.items()}
+
+
+class _StringContainer:
+    """Container element (defs, symbol, g, clipPath) of a StringDrawing"""
+    def __init__(self, tag, **extra):
+        self.tag = tag
+        self.attribs = _svg_attribs(extra)
+        self.elements = []
+
+    def add(self, element):
+        self.elements.append(element)
+        return element
+
+    def tostring(self):
+        if not self.elements:
+            return _svg_element(self.tag, self.attribs)
+        head = _svg_element(self.tag, self.attribs)[:-3] + '>'
+        return head + ''.join(
+            e if isinstance(e, str) else e.tostring() for e in self.elements
+        ) + f'</{self.tag}>'
+
+
+class StringDrawing:
+    """Drop-in for the subset of svgwrite.Drawing used by the builders
+
+    Each element is serialized as soon as it is created and kept as a
+    string fragment, so there's no element tree to validate or walk.
+    Attributes are written in svgwrite's sorted order and escaped like
+    ElementTree, which makes the output byte-identical to svgwrite's.
+    """
+    def __init__(self, size=('100%', '100%'), **extra):
+        self.attribs = _svg_attribs(extra)
+        self.attribs['width'], self.attribs['height'] = size
+        self.defs = _StringContainer('defs')
+        self.elements = []
+
+    def add(self, element):
+        self.elements.append(element)
+        return element
+
+    def rect(self, insert=None, size=None, rx=None, ry=None, **extra):
+        attribs = _svg_attribs(extra)
+        if insert is not None:
+            attribs['x'], attribs['y'] = insert
+        if size is not None:
+            attribs['width'], attribs['height'] = size
+        attribs['rx'] = rx
+        attribs['ry'] = ry
+        return _svg_element('rect', attribs)
+
+    def circle(self, center=None, r=None, **extra):
+        attribs = _svg_attribs(extra)
+        if center is not None:
+            attribs['cx'], attribs['cy'] = center
+        attribs['r'] = r
+        return _svg_element('circle', attribs)
+
+    def line(self, start=None, end=None, **extra):
+        attribs = _svg_attribs(extra)
+        if start is not None:
+            attribs['x1'], attribs['y1'] = start
+        if end is not None:
+            attribs['x2'], attribs['y2'] = end
+        return _svg_element('line', attribs)
+
+    def path(self, d=None, **extra):
+        attribs = _svg_attribs(extra)
+        attribs['d'] = d
+        return _svg_element('path', attribs)
+
+    def text(self, text, insert=None, **extra):
+        attribs = _svg_attribs(extra)
+        if insert is not None:
+            attribs['x'], attribs['y'] = insert
+        return _svg_element('text', attribs, str(text))
+
+    def use(self, href, insert=None, size=None, **extra):
+        attribs = _svg_attribs(extra)
+        attribs['xlink:href'] = href
+        if insert is not None:
+            attribs['x'], attribs['y'] = insert
+        if size is not None:
+            attribs['width'], attribs['height'] = size
+        return _svg_element('use', attribs)
+
+    def symbol(self, **extra):
+        return _StringContainer('symbol', **extra)
+
+    def g(self, **extra):
+        return _StringContainer('g', **extra)
+
+    def clipPath(self, **extra):
+        return _StringContainer('clipPath', **extra)
+
+    def style(self, content='', **extra):
+        attribs = _svg_attribs(extra)
+        attribs['type'] = 'text/css'
+        head = _svg_element('style', attribs)[:-3]
+        return f'{head}><![CDATA[{content}]]></style>'
+
+    def tostring(self):
+        attribs = dict(self.attribs, baseProfile='full', version='1.1')
+        head = _svg_element('svg', attribs)[:-3] + SVG_NAMESPACES + '>'
+        body = [e if isinstance(e, str) else e.tostring() for e in self.elements]
+        return ''.join([head, self.defs.tostring(), *body, '</svg>'])
+
+
+def svgwrite_drawing(size, **extra):
+    """svgwrite.Drawing, imported on first use"""
+    import svgwrite
+    return svgwrite.Drawing(size=size, **extra)
+
+
+# Interchangeable drawing factories; svgwrite is the reference backend
+BACKENDS = {
+    'svgwrite': svgwrite_drawing,
+    'string': StringDrawing
+}
+
+
+# Inline text styles used by the builders -> typography scale classes
+TYPE_SCALE = {
+    'font-family: SF Pro Text; font-size: 24px; font-weight: 600': 'lt-title',
+    'font-family: SF Pro Text; font-size: 24px; font-weight: bold': 'lt-figure',
+    'font-family: SF Pro Text; font-size: 17px; font-weight: 600': 'lt-headline',
+    'font-family: SF Pro Text; font-size: 16px': 'lt-callout',
+    'font-family: SF Pro Text; font-size: 15px; font-weight: 600': 'lt-subhead-strong',
+    'font-family: SF Pro Text; font-size: 15px': 'lt-subhead',
+    'font-family: SF Pro Text; font-size: 13px': 'lt-footnote',
+    'font-family: SF Pro Text; font-size: 12px': 'lt-caption'
+}
+
+
+class StyleSheet:
+    """Classes for the typography scale and the palette's color roles
+
+    classify() swaps inline style strings and palette fills/strokes for
+    class names; anything it doesn't know stays an inline attribute.
+    Names are kept short since they repeat on every element: lt-* for
+    type, lf-<role> for fills and ls-<role> for strokes.
+    """
+    PREFIXES = {'fill': 'lf', 'stroke': 'ls'}
+
+    def __init__(self, colors):
+        self.colors = colors
+        # Color value -> role, first role wins if two share a value
+        self._roles = {}
+        for role, value in colors.items():
+            self._roles.setdefault(value, role)
+
+    def classify(self, extra):
+        """Rewrite svgwrite-style keyword arguments to use classes"""
+        classes = [extra.pop('class_')] if 'class_' in extra else []
+        style = extra.get('style')
+        if style in TYPE_SCALE:
+            classes.append(TYPE_SCALE[extra.pop('style')])
+        for prop, prefix in self.PREFIXES.items():
+            role = self._roles.get(extra.get(prop))
+            if role is not None:
+                del extra[prop]
+                classes.append(f'{prefix}-{role}')
+        if classes:
+            extra['class_'] = ' '.join(classes)
+        return extra
+
+    def css(self):
+        """Return the stylesheet text"""
+        rules = []
+        for style, name in TYPE_SCALE.items():
+            rules.append(f".{name}{{{style.replace(': ', ':').replace('; ', ';')}}}")
+        for role, value in self.colors.items():
+            for prop, prefix in self.PREFIXES.items():
+                rules.append(f'.{prefix}-{role}{{{prop}:{value}}}')
+        return ''.join(rules)
+
+
+class ClassedDrawing:
+    """Wraps a drawing so its elements get stylesheet classes"""
+    FACTORIES = ('rect', 'circle', 'line', 'path', 'text', 'use', 'symbol')
+
+    def __init__(self, dwg, stylesheet):
+        self.dwg = dwg
+        self.stylesheet = stylesheet
+
+    def __getattr__(self, name):
+        attr = getattr(self.dwg, name)
+        if name not in self.FACTORIES:
+            return attr
+        classify = self.stylesheet.classify
+        return lambda *args, **extra: attr(*args, **classify(extra))
+
+
+# Palettes by color role; 'light' is the journey map's original palette
+THEMES = {
+    'light': {
+        'background': '#FFFFFF',
+        'text': '#000000',
+        'primary': '#007AFF',
+        'secondary': '#666666',
+        'border': '#C5C5C7',
+        'surface': '#F5F5F5',
+        'on_primary': 'white',
+        'notch': '#333333',
+        'avatar': '#E5E5EA'
+    },
+    'dark': {
+        'background': '#1C1C1E',
+        'text': '#FFFFFF',
+        'primary': '#0A84FF',
+        'secondary': '#98989D',
+        'border': '#48484A',
+        'surface': '#2C2C2E',
+        'on_primary': 'white',
+        'notch': '#000000',
+        'avatar': '#3A3A3C'
+    },
+    'lofi': {
+        'background': '#FBF7F0',
+        'text': '#2B2118',
+        'primary': '#C2410C',
+        'secondary': '#7C6F64',
+        'border': '#D6CCC2',
+        'surface': '#F1E9DD',
+        'on_primary': '#FFF7ED',
+        'notch': '#2B2118',
+        'avatar': '#E7D8C9'
+    }
+}
+
+
+def theme_vars(colors):
+    """Palette whose values are CSS variables named after the roles"""
+    return {role: f'var(--lofi-{role})' for role in colors}
+
+
+# numpy has no 24-bit type: this dtype name stands for packed little-endian
+# 24-bit PCM, mapped as bytes, (frames, channels, 3), see widen_int24()
+INT24 = '<i3'
+
+# WAV format tag -> sample dtype by bits per sample
+WAV_DTYPES = {
+    1: {8: 'u1', 16: '<i2', 24: INT24, 32: '<i4'},
+    3: {32: '<f4', 64: '<f8'}
+}
+
+
+def map_samples(path, dtype, channels, offset=0, frames=None):
+    """Memory-map frames of dtype samples from offset (default: to the end)"""
+    import numpy as np
+
+    storage, shape = ('u1', (channels, 3)) if dtype == INT24 else (dtype, (channels,))
+    if frames is None:
+        frame_bytes = np.dtype(storage).itemsize * math.prod(shape)
+        frames = max(0, os.path.getsize(path) - offset) // frame_bytes
+    if not frames:
+        # mmap refuses empty files and empty ranges
+        return np.empty((0, *shape), storage)
+    return np.memmap(path, dtype=storage, mode='r', offset=offset, shape=(frames, *shape))
+
+
+def open_samples(source, dtype='<i2', channels=1):
+    """Memory-map audio as a (frames, channels) array without reading it
+
+    source is a WAV file, a raw PCM file (described by dtype, which may
+    be INT24, and channels) or an array, which is returned as is.
+    """
+    import numpy as np
+
+    if not isinstance(source, (str, bytes, os.PathLike)):
+        samples = np.asarray(source)
+        if not len(samples):
+            return samples.reshape(0, 1)
+        return samples.reshape(len(samples), -1)
+
+    with open(source, 'rb') as f:
+        header = f.read(12)
+        if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return map_samples(source, dtype, channels)
+
+        # Walk the chunks for 'fmt ' and 'data', skipping everything else
+        offset, fmt = 12, None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{source}: no data chunk")
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            offset += 8
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                f.seek(offset + size + size % 2)
+            elif chunk_id == b'data':
+                break
+            else:
+                f.seek(offset + size + size % 2)
+            offset += size + size % 2
+
+    if fmt is None:
+        raise ValueError(f"{source}: no fmt chunk")
+    tag, channels, _, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if tag == 0xFFFE:
+        # WAVE_FORMAT_EXTENSIBLE keeps the real tag in the sub-format GUID
+        tag = struct.unpack('<H', fmt[24:26])[0]
+    try:
+        dtype = WAV_DTYPES[tag][bits]
+    except KeyError:
+        raise ValueError(f"{source}: unsupported WAV encoding (format {tag}, {bits} bits)") from None
+    frame_bytes = channels * bits // 8
+    available = os.path.getsize(source) - offset
+    # Files still being written often say 0 or 0xFFFFFFFF, use what's there
+    if size not in (0, 0xFFFFFFFF):
+        available = min(size, available)
+    return map_samples(source, dtype, channels, offset, max(0, available) // frame_bytes)
+
+
+def widen_int24(packed):
+    """(frames, channels) int32 from packed little-endian 24-bit samples"""
+    import numpy as np
+
+    packed = np.asarray(packed)
+    return (
+        packed[..., 0].astype(np.int32)
+        | packed[..., 1].astype(np.int32) << 8
+        | packed[..., 2].astype(np.int8).astype(np.int32) << 16
+    )
+
+
+def sample_scale(dtype):
+    """(offset, scale) that map samples of dtype to -1..1"""
+    import numpy as np
+
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        return 0.0, 1.0
+    if dtype.kind == 'u':
+        half = 2 ** (dtype.itemsize * 8 - 1)
+        return float(half), 1.0 / half
+    return 0.0, 1.0 / 2 ** (dtype.itemsize * 8 - 1)
+
+
+def minmax_decimate(samples, columns, chunk_frames=1 << 22):
+    """Per-column (mins, maxs) of samples across all channels, in -1..1
+
+    Each column covers an equal block of frames. The blocks are reduced
+    with vectorized min/max over reshaped views of the memory-mapped
+    samples, chunk_frames at a time, so only one chunk is touched at
+    once however long the file is. Packed 24-bit samples are widened a
+    chunk at a time.
+    """
+    import numpy as np
+
+    packed = samples.ndim == 3
+    frames = len(samples)
+    columns = max(1, min(columns, frames))
+    block = frames // columns
+    mins = np.empty(columns)
+    maxs = np.empty(columns)
+    step = max(1, chunk_frames // max(block, 1))
+    for start in range(0, columns, step):
+        stop = min(columns, start + step)
+        view = samples[start * block:stop * block]
+        if packed:
+            view = widen_int24(view)
+        view = view.reshape(stop - start, -1)
+        mins[start:stop] = view.min(axis=1)
+        maxs[start:stop] = view.max(axis=1)
+    offset, scale = (0.0, 1.0 / 2 ** 23) if packed else sample_scale(samples.dtype)
+    return (mins - offset) * scale, (maxs - offset) * scale
+
+
+class PeakPyramid:
+    """Min/max peaks of an audio file at power-of-two block sizes
+
+    Level k holds one (min, max) pair per BASE_BLOCK * 2**k frames,
+    taken across channels and stored as int16 scaled to -1..1. The
+    pyramid lives in a sidecar file next to the audio (<file>.peaks). When
+    the audio has grown since then, e.g. while recording, only the new
+    blocks are scanned and the tail of each level is recomputed; audio
+    that was replaced or cut short is scanned again from the start.
+    peaks() answers any view from the coarsest level that still has a
+    block per pixel, so zooming and scrolling cost O(pixels).
+
+    for_file() keeps the MAX_LOADED most recently used pyramids. Updates
+    take the pyramid's own lock and publish (samples, levels, covered)
+    as one tuple, view, which peaks() reads once, so a lane drawn while
+    the file grows or is replaced sees one consistent state.
+    """
+    BASE_BLOCK = 256
+    OVERSAMPLE = 4
+    MAGIC = b'LOFIPK02'
+    # magic, block, covered, levels, dtype, channels, then the audio's
+    # size and mtime and the digest of the scanned frames (_digest())
+    HEADER = struct.Struct('<8sIQH8sHQq32s')
+
+    MAX_LOADED = 16
+
+    _loaded = OrderedDict()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path, dtype='<i2', channels=1):
+        self.path = path
+        # How a raw PCM file is read, WAV files describe themselves
+        self.format = (dtype, channels)
+        self.sidecar = f'{path}.peaks'
+        self.covered = 0
+        self.levels = []
+        # (size, mtime) of the audio when the levels were last updated
+        self.stat = None
+        self.digest = b''
+        self.view = ((), [], 0)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, path, dtype='<i2', channels=1):
+        """Pyramid for path, shared per process and brought up to date"""
+        key = (os.fspath(path), dtype, channels)
+        with cls._registry_lock:
+            pyramid = cls._loaded.pop(key, None) or cls(*key)
+            cls._loaded[key] = pyramid
+            while len(cls._loaded) > cls.MAX_LOADED:
+                cls._loaded.popitem(last=False)
+        # Scanning holds only this pyramid's lock, other files go ahead
+        pyramid.update()
+        return pyramid
+
+    def _signature(self):
+        dtype = INT24 if self.samples.ndim == 3 else self.samples.dtype.str
+        return dtype.encode().ljust(8), self.samples.shape[1]
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _digest(self, covered):
+        """Digest of the first and the last base block of frames ..covered"""
+        import numpy as np
+
+        digest = hashlib.sha256()
+        if covered:
+            for block in (self.samples[:self.BASE_BLOCK], self.samples[covered - self.BASE_BLOCK:covered]):
+                digest.update(np.ascontiguousarray(block).tobytes())
+        return digest.digest()
+
+    def _still_valid(self, covered, stat, digest, current):
+        """Whether peaks of frames ..covered, taken when the audio had stat, still apply
+
+        They do for unchanged audio and for audio that only grew, as
+        while recording, with the scanned frames' ends unchanged. A
+        shorter file or another take of any length fails the check; one
+        rewritten at the same size is taken as another take.
+        """
+        if stat == current:
+            return True
+        if covered > len(self.samples) or current[0] <= stat[0]:
+            return False
+        return self._digest(covered) == digest
+
+    def _load(self, current):
+        import numpy as np
+
+        try:
+            with open(self.sidecar, 'rb') as f:
+                data = f.read()
+            magic, block, covered, count, dtype, channels, size, mtime, digest = self.HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return
+        if (magic, block, (dtype, channels)) != (self.MAGIC, self.BASE_BLOCK, self._signature()):
+            return
+        if not self._still_valid(covered, (size, mtime), digest, current):
+            return
+        offset = self.HEADER.size
+        levels = []
+        for _ in range(count):
+            (entries,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+            levels.append(np.frombuffer(data, '<i2', entries * 2, offset).reshape(-1, 2).copy())
+            offset += entries * 4
+        self.covered, self.levels, self.digest = covered, levels, digest
+
+    def _save(self):
+        dtype, channels = self._signature()
+        parts = [self.HEADER.pack(
+            self.MAGIC, self.BASE_BLOCK, self.covered, len(self.levels), dtype, channels,
+            *self.stat, self.digest
+        )]
+        for level in self.levels:
+            parts.append(struct.pack('<Q', len(level)))
+            parts.append(level.astype('<i2').tobytes())
+        try:
+            write_atomic(self.sidecar, b''.join(parts))
+        except OSError:
+            # Read-only location: the pyramid still works from memory
+            pass
+
+    def update(self):
+        """Scan frames added since the last update into the pyramid"""
+        with self._lock:
+            changed = self._update()
+            self.view = (self.samples, self.levels, self.covered)
+            return changed
+
+    def _update(self):
+        import numpy as np
+
+        # Taken first: frames written after it are picked up next time
+        stat = self._stat()
+        if stat == self.stat:
+            return False
+        self.samples = open_samples(self.path, *self.format)
+        if self.stat is None:
+            self._load(stat)
+        elif not self._still_valid(self.covered, self.stat, self.digest, stat):
+            self.covered, self.levels, self.digest = 0, [], b''
+        self.stat = stat
+        complete = len(self.samples) // self.BASE_BLOCK * self.BASE_BLOCK
+        if complete <= self.covered:
+            return False
+        mins, maxs = minmax_decimate(
+            self.samples[self.covered:complete], (complete - self.covered) // self.BASE_BLOCK
+        )
+        fresh = np.column_stack([mins, maxs]) * 32767
+        fresh = np.clip(np.round(fresh), -32767, 32767).astype('<i2')
+        # A new list: the published view keeps the levels it was taken with
+        levels = list(self.levels)
+        if not levels:
+            levels = [fresh]
+        else:
+            levels[0] = np.concatenate([levels[0], fresh])
+        # Each coarser level pairs up entries of the one below; only the
+        # pairs past what it already had need computing
+        k = 0
+        while len(levels[k]) >= 2:
+            below = levels[k]
+            if k + 1 == len(levels):
+                levels.append(below[:0].copy())
+            level = levels[k + 1]
+            start, stop = len(level), len(below) // 2
+            if stop > start:
+                pairs = below[2 * start:2 * stop].reshape(-1, 2, 2)
+                merged = np.column_stack([pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)])
+                levels[k + 1] = np.concatenate([level, merged])
+            k += 1
+        self.levels = levels
+        self.covered = complete
+        self.digest = self._digest(complete)
+        self._save()
+        return True
+
+    def peaks(self, columns, start=0, stop=None):
+        """(mins, maxs) in -1..1 for frames start..stop in columns pixels"""
+        import numpy as np
+
+        samples, levels, covered = self.view
+        frames = len(samples)
+        stop = frames if stop is None else min(stop, frames)
+        start = max(0, min(start, stop))
+        columns = max(1, min(columns, stop - start))
+        per_column = (stop - start) / columns
+        # Column edges snap to block edges, so keep blocks at most a
+        # quarter column wide
+        span = per_column / self.OVERSAMPLE
+        if span < self.BASE_BLOCK or not levels:
+            # Zoomed in past the finest level: the raw window is small
+            return minmax_decimate(samples[start:stop], columns)
+
+        k = min(len(levels) - 1, int(np.log2(span / self.BASE_BLOCK)))
+        block = self.BASE_BLOCK << k
+        level = levels[k]
+        # Entry index where each column starts, clipped to what the level covers
+        edges = (start + np.arange(columns + 1) * per_column) // block
+        edges = np.minimum(edges.astype(np.int64), len(level))
+        first, last = edges[0], max(edges[-1], edges[0] + 1)
+        window = level[first:last]
+        bounds = np.minimum(edges[:-1] - first, len(window) - 1)
+        mins = np.minimum.reduceat(window[:, 0], bounds) / 32767
+        maxs = np.maximum.reduceat(window[:, 1], bounds) / 32767
+        if stop > covered:
+            # Frames after the last complete base block come from the samples
+            tail_mins, tail_maxs = minmax_decimate(samples[max(start, covered):stop], 1)
+            mins[-1] = min(mins[-1], tail_mins[0])
+            maxs[-1] = max(maxs[-1], tail_maxs[0])
+        return mins, maxs
+
+
+def waveform_path(mins, maxs, x, width, center, half_height):
+    """SVG path data outlining a min/max envelope as one closed shape"""
+    import numpy as np
+
+    columns = len(mins)
+    xs = x + (np.arange(columns) + 0.5) * (width / columns)
+    tops = center - np.clip(maxs, -1, 1) * half_height
+    bottoms = center - np.clip(mins, -1, 1) * half_height
+    # Keep silent stretches visible as a hairline
+    bottoms = np.maximum(bottoms, tops + 0.5)
+    points = np.concatenate([
+        np.column_stack([xs, tops]),
+        np.column_stack([xs[::-1], bottoms[::-1]])
+    ]).round(1)
+    coords = ' '.join(f'{px:g},{py:g}' for px, py in points)
+    return f'M {coords} Z'
+
+
+def minmax_preselect(values, buckets):
+    """Indices of each bucket's min and max, in order, for a 1-D array"""
+    import numpy as np
+
+    size = len(values) // buckets
+    rows = values[:size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picks = np.column_stack([rows.argmin(axis=1), rows.argmax(axis=1)])
+    picks.sort(axis=1)
+    indices = (picks + offsets[:, None]).ravel()
+    # Points after the last whole bucket keep the series' true end
+    return np.append(indices, len(values) - 1)
+
+
+def lttb_indices(xs, ys, threshold):
+    """Indices of threshold points picked by Largest-Triangle-Three-Buckets
+
+    Vectorized: each bucket's point makes the largest triangle with the
+    mean of the previous and the mean of the next bucket, where exact
+    LTTB would use the previous pick and needs a Python loop.
+    """
+    import numpy as np
+
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    # First and last points are kept, the rest split into buckets
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    means_x = np.add.reduceat(xs[1:-1], edges[:-1] - 1) / sizes
+    means_y = np.add.reduceat(ys[1:-1], edges[:-1] - 1) / sizes
+    prev_x = np.concatenate([xs[:1], means_x[:-1]])
+    prev_y = np.concatenate([ys[:1], means_y[:-1]])
+    next_x = np.concatenate([means_x[1:], xs[-1:]])
+    next_y = np.concatenate([means_y[1:], ys[-1:]])
+    bucket = np.repeat(np.arange(len(sizes)), sizes)
+    px, py = xs[1:-1], ys[1:-1]
+    areas = np.abs(
+        (prev_x[bucket] - next_x[bucket]) * (py - prev_y[bucket])
+        - (prev_x[bucket] - px) * (next_y[bucket] - prev_y[bucket])
+    )
+    best = np.maximum.reduceat(areas, edges[:-1] - 1)
+    hits = np.flatnonzero(areas == best[bucket])
+    _, first = np.unique(bucket[hits], return_index=True)
+    return np.concatenate([[0], hits[first] + 1, [count - 1]])
+
+
+def chart_path(series, x, y, width, height):
+    """SVG path data for a time series as a polyline fitted to the box
+
+    series is a 1-D array of evenly spaced values or an (n, 2) array of
+    (time, value) rows in any order. Samples that aren't finite (gaps,
+    NaN, inf) are left out. Long series are cut down to min/max pairs per pixel first,
+    then LTTB keeps one point per pixel.
+    """
+    import numpy as np
+
+    data = np.asarray(series, dtype=np.float64)
+    if data.ndim == 1:
+        values, times = data, np.arange(len(data), dtype=np.float64)
+    else:
+        times, values = data[:, 0], data[:, 1]
+    finite = np.isfinite(values) & np.isfinite(times)
+    if not finite.all():
+        times, values = times[finite], values[finite]
+    if data.ndim == 2 and (np.diff(times) < 0).any():
+        # Rows that arrive out of order; equal times keep their order
+        order = np.argsort(times, kind='stable')
+        times, values = times[order], values[order]
+    columns = max(3, int(width))
+    if len(values) < 2:
+        return None
+    indices = np.arange(len(values))
+    if len(values) > 4 * columns:
+        indices = minmax_preselect(values, 2 * columns)
+    xs = times[indices]
+    ys = values[indices]
+    picked = lttb_indices(xs, ys, columns)
+    xs, ys = xs[picked], ys[picked]
+
+    def fit(v, origin, extent):
+        span = v.max() - v.min()
+        if not span:
+            return np.full(len(v), origin + extent / 2)
+        return origin + (v - v.min()) / span * extent
+
+    # SVG y grows downwards: larger values sit higher in the box
+    points = np.column_stack([fit(xs, x, width), fit(-ys, y, height)]).round(1)
+    coords = ' '.join(f'{px:g},{py:g}' for px, py in points.tolist())
+    return f'M {coords}'
+
+
+# Type scale names a spec text's 'style' can use -> inline style
+TEXT_STYLES = {name[3:]: style for style, name in TYPE_SCALE.items()}
+
+# Advance widths in 1/1000 em of printable ASCII (space to ~) from the
+# Helvetica and Helvetica-Bold AFMs, close enough to SF Pro Text for
+# catching overflow; weights of 600 and up measure as bold
+GLYPH_WIDTHS = {
+    'regular': (
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584
+    ),
+    'bold': (
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584
+    )
+}
+
+
+@functools.lru_cache(maxsize=None)
+def font_metrics(style):
+    """(font size in px, 'regular' or 'bold') of an inline text style"""
+    size = re.search(r'font-size:\s*([\d.]+)px', style)
+    weight = re.search(r'font-weight:\s*(\w+)', style)
+    bold = weight is not None and (
+        weight.group(1) == 'bold' or weight.group(1).isdigit() and int(weight.group(1)) >= 600
+    )
+    return float(size.group(1)) if size else 16.0, 'bold' if bold else 'regular'
+
+
+@functools.lru_cache(maxsize=None)
+def glyph_advances(size, weight):
+    """Character -> advance in px at a font size and weight"""
+    return {chr(32 + i): width * size / 1000 for i, width in enumerate(GLYPH_WIDTHS[weight])}
+
+
+# Tables for the type scale are built up front
+for _style in TYPE_SCALE:
+    glyph_advances(*font_metrics(_style))
+
+
+@functools.lru_cache(maxsize=65536)
+def text_width(text, style):
+    """Width in px of a line of text in an inline style"""
+    size, weight = font_metrics(style)
+    advances = glyph_advances(size, weight)
+    # Characters outside the tables count as a digit
+    fallback = 0.556 * size
+    return sum(advances.get(char, fallback) for char in text)
+
+
+@functools.lru_cache(maxsize=4096)
+def wrap_text(text, style, width):
+    """Break text at spaces into lines no wider than width
+
+    A single word wider than width stays on its own line, overflowing.
+    """
+    lines = []
+    line = ''
+    for word in text.split():
+        candidate = f'{line} {word}' if line else word
+        if line and text_width(candidate, style) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    lines.append(line)
+    return tuple(lines)
+
+
+# Syntax allowed in spec expressions: arithmetic on numbers and names
+SPEC_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.USub, ast.UAdd
+)
+
+SPEC_FIELD = re.compile(r'\{([^{}]+)\}')
+
+
+@functools.lru_cache(maxsize=None)
+def spec_expression(source):
+    """Compile a spec expression such as 'W/2' or 'y + 30 + i*50'"""
+    tree = ast.parse(source.strip(), mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, SPEC_NODES):
+            raise ValueError(f"Unsupported syntax in spec expression {source!r}")
+    return compile(tree, '<spec>', 'eval')
+
+
+def spec_value(value, env):
+    """Evaluate a spec value: strings are expressions, lists are points"""
+    if isinstance(value, str):
+        return eval(spec_expression(value), {'__builtins__': {}}, env)
+    if isinstance(value, (list, tuple)):
+        return tuple(spec_value(v, env) for v in value)
+    return value
+
+
+def spec_text(template, env):
+    """Fill the {expression} fields of a spec string"""
+    if '{' not in template:
+        return template
+    return SPEC_FIELD.sub(lambda match: str(spec_value(match.group(1), env)), template)
+
+
+# Screens as data: nav bar title, whether it has a back arrow, and items
+# drawn in order. Coordinates are expressions over W and H (screen size)
+# and the variables a 'stack' or 'list' sets for each entry: its index
+# (i, or the stack's 'index' name), n = index + 1, its position (y, or x
+# for axis 'x') and the entry's fields. Text, path data and colors are
+# strings with {expression} fields; colors name palette roles. Text is
+# measured with the glyph tables: 'wrap' breaks it into lines, and text
+# that still doesn't fit is flagged (AthleteAppWireframes.overflows).
+# In the clickable prototype an item's 'link' names the screen it leads
+# to, a string 'back' where the back arrow goes and 'next' where the
+# title leads on screens without a button forward.
+#
+# Item types:
+#   rect, circle, line, path, text  one element, see spec_element
+#   field    labelled input box at y, optional placeholder and dropdown
+#   button   the primary button at the bottom of the screen
+#   stack    children repeated for 'each' entry (or 'count' times),
+#            advancing by 'pitch' from 'start'
+#   flow     children placed top-down from 'start', each at y, 'gap'
+#            apart, by their measured height ('extent' overrides it)
+#   list     rows from the 'param' build parameter when given, else
+#            'count' rows of 'defaults'; see AthleteAppWireframes.fill_list
+#   slot     children, unless the slot_<draw> method draws the 'param'
+#            build parameter itself
+SCREEN_SPECS = {
+    'welcome': {
+        'title': "Welcome",
+        'back': False,
+        'items': [
+            # App logo
+            {'type': 'circle', 'at': ['W/2', 180], 'r': 50, 'fill': 'primary'},
+            {'type': 'text', 'text': "Athlete Verification", 'at': ['W/2', 280], 'anchor': 'middle',
+             'fill': 'text', 'style': 'title'},
+            {'type': 'text', 'text': "Verify your professional status", 'at': ['W/2', 320], 'anchor': 'middle',
+             'fill': 'secondary', 'style': 'callout'},
+            # Start button
+            {'type': 'rect', 'at': [20, 'H - 180'], 'size': ['W - 40', 50], 'rx': 25, 'fill': 'primary',
+             'link': 'league_selection'},
+            {'type': 'text', 'text': "Start Verification", 'at': ['W/2', 'H - 145'], 'anchor': 'middle',
+             'fill': 'on_primary', 'style': 'headline'}
         ]
+    },
+    'league_selection': {
+        'title': "League Selection",
+        'back': 'welcome',
+        'items': [
+            {'type': 'flow', 'start': 108, 'gap': 10, 'children': [
+                {'type': 'stack', 'start': 'y', 'pitch': 80, 'each': [
+                    {'label': "Select League", 'placeholder': "Choose your league", 'dropdown': True},
+                    {'label': "Select Team", 'placeholder': "Choose your team", 'dropdown': True},
+                    {'label': "Player ID", 'placeholder': "Enter your ID", 'dropdown': False}
+                ], 'children': [
+                    {'type': 'field', 'label': '{label}', 'y': 'y', 'placeholder': '{placeholder}', 'dropdown': 'dropdown'}
+                ]},
+                # Help text
+                {'type': 'text', 'text': "This information will be verified with your league", 'at': [20, 'y'],
+                 'wrap': True, 'fill': 'secondary', 'style': 'footnote'}
+            ]},
+            {'type': 'button', 'label': "Continue", 'link': 'document_upload'}
+        ]
+    },
+    'document_upload': {
+        'title': "Document Upload",
+        'back': 'league_selection',
+        'items': [
+            {'type': 'text', 'text': "Upload Required Documents", 'at': [20, 108], 'fill': 'text', 'style': 'headline'},
+            {'type': 'stack', 'start': 148, 'pitch': 110, 'each': ["League ID", "Team Contract", "Photo ID"], 'children': [
+                {'type': 'text', 'text': '{item}', 'at': [20, 'y'], 'fill': 'text', 'style': 'subhead'},
+                {'type': 'rect', 'at': [20, 'y + 10'], 'size': ['W - 40', 80], 'rx': 8,
+                 'fill': 'none', 'stroke': 'border', 'stroke_dasharray': '5,5'},
+                {'type': 'text', 'text': "Tap to Upload", 'at': ['W/2', 'y + 50'], 'anchor': 'middle',
+                 'fill': 'primary', 'style': 'subhead'}
+            ]},
+            {'type': 'button', 'label': "Submit Documents", 'link': 'profile_setup'}
+        ]
+    },
+    'profile_setup': {
+        'title': "Profile Setup",
+        'back': 'document_upload',
+        'next': 'studio_dashboard',
+        'items': [
+            # Profile photo
+            {'type': 'circle', 'at': ['W/2', 158], 'r': 40, 'fill': 'surface', 'stroke': 'border'},
+            {'type': 'text', 'text': "Add Photo", 'at': ['W/2', 218], 'anchor': 'middle', 'fill': 'primary', 'style': 'subhead'},
+            {'type': 'stack', 'start': 248, 'pitch': 'height + 20', 'each': [
+                {'label': "Professional Bio", 'height': 80},
+                {'label': "Career Highlights", 'height': 44},
+                {'label': "Social Media Links", 'height': 44}
+            ], 'children': [
+                {'type': 'field', 'label': '{label}', 'y': 'y', 'height': 'height'}
+            ]}
+        ]
+    },
+    'studio_dashboard': {
+        'title': "Studio",
+        'back': 'profile_setup',
+        'items': [
+            # Tab bar
+            {'type': 'stack', 'each': [
+                {'tab': "DAW", 'fill': 'surface', 'color': 'primary', 'link': 'daw'},
+                {'tab': "Beats", 'fill': 'none', 'color': 'secondary', 'link': ''},
+                {'tab': "Projects", 'fill': 'none', 'color': 'secondary', 'link': ''}
+            ], 'children': [
+                {'type': 'rect', 'at': ['i * (W/3)', 88], 'size': ['W/3', 44], 'fill': '{fill}', 'stroke': 'border',
+                 'link': '{link}'},
+                {'type': 'text', 'text': '{tab}', 'at': ['i * (W/3) + (W/3)/2', 116], 'anchor': 'middle',
+                 'fill': '{color}', 'style': 'subhead'}
+            ]},
+            {'type': 'text', 'text': "Recent Projects", 'at': [20, 152], 'fill': 'text', 'style': 'headline'},
+            # Project grid
+            {'type': 'list', 'param': 'projects', 'top': 172, 'bottom': 'H - 90', 'pitch': 120, 'columns': 2,
+             'count': 4, 'fields': ['title'], 'defaults': {'title': "Project {n}"}, 'row': [
+                {'type': 'rect', 'at': ['20 + col*(W/2 - 30)', 'y'], 'size': ['W/2 - 40', 100], 'rx': 8, 'fill': 'surface',
+                 'link': 'daw'},
+                {'type': 'text', 'text': '{title}', 'at': ['30 + col*(W/2 - 30)', 'y + 30'], 'fill': 'text', 'style': 'subhead'}
+            ]},
+            {'type': 'button', 'label': "New Recording", 'link': 'daw'}
+        ]
+    },
+    'daw': {
+        'title': "Recording",
+        'back': 'studio_dashboard',
+        'next': 'content_management',
+        'items': [
+            # Waveform area
+            {'type': 'rect', 'at': [20, 108], 'size': ['W - 40', 200], 'fill': 'surface'},
+            # Track lanes
+            {'type': 'stack', 'count': 4, 'children': [
+                {'type': 'text', 'text': "Track {n}", 'at': [25, '138 + i*50'], 'fill': 'secondary', 'style': 'caption'},
+                {'type': 'slot', 'param': 'tracks', 'draw': 'waveform',
+                 'args': {'track': 'i', 'x': 70, 'center': '133 + i*50', 'width': 'W - 100'}, 'children': [
+                    {'type': 'line', 'from': [70, '133 + i*50'], 'to': ['W - 30', '133 + i*50'], 'stroke': 'border'}
+                ]},
+                # Mute/Solo buttons
+                {'type': 'rect', 'at': [20, '118 + i*50'], 'size': [20, 20], 'fill': 'none', 'stroke': 'border'}
+            ]},
+            # Transport controls
+            {'type': 'stack', 'each': [
+                {'label': "Record", 'stroke': 'primary'},
+                {'label': "Play", 'stroke': 'border'},
+                {'label': "Stop", 'stroke': 'border'},
+                {'label': "Mix", 'stroke': 'border'}
+            ], 'children': [
+                {'type': 'circle', 'at': ['W/8 + i*W/4', 358], 'r': 25, 'fill': 'none', 'stroke': '{stroke}', 'stroke_width': 2},
+                {'type': 'text', 'text': '{label}', 'at': ['W/8 + i*W/4', 398], 'anchor': 'middle', 'fill': 'text', 'style': 'footnote'}
+            ]}
+        ]
+    },
+    'content_management': {
+        'title': "Content Management",
+        'back': 'studio_dashboard',
+        'items': [
+            {'type': 'text', 'text': "Upload Tracks", 'at': [20, 108], 'fill': 'text', 'style': 'headline'},
+            {'type': 'rect', 'at': [20, 128], 'size': ['W - 40', 120], 'rx': 8,
+             'fill': 'none', 'stroke': 'border', 'stroke_dasharray': '5,5'},
+            {'type': 'text', 'text': "Drag and drop tracks here", 'at': ['W/2', 178], 'anchor': 'middle',
+             'fill': 'secondary', 'style': 'subhead'},
+            {'type': 'text', 'text': "Recent Uploads", 'at': [20, 268], 'fill': 'text', 'style': 'subhead'},
+            {'type': 'list', 'param': 'uploads', 'top': 288, 'bottom': 'H - 90', 'pitch': 60,
+             'count': 3, 'fields': ['title'], 'defaults': {'title': "Track {n}"}, 'row': [
+                {'type': 'rect', 'at': [20, 'y'], 'size': ['W - 40', 50], 'rx': 8, 'fill': 'surface'},
+                {'type': 'text', 'text': '{title}', 'at': [40, 'y + 30'], 'fill': 'text', 'style': 'subhead'}
+            ]},
+            {'type': 'button', 'label': "Set Distribution", 'link': 'release_management'}
+        ]
+    },
+    'release_management': {
+        'title': "Release Management",
+        'back': 'content_management',
+        'items': [
+            {'type': 'text', 'text': "Release Schedule", 'at': [20, 108], 'fill': 'text', 'style': 'headline'},
+            # Calendar grid
+            {'type': 'rect', 'at': [20, 128], 'size': ['W - 40', 200], 'rx': 8, 'fill': 'surface'},
+            {'type': 'text', 'text': "Distribution Channels", 'at': [20, 348], 'fill': 'text', 'style': 'subhead'},
+            {'type': 'stack', 'each': ["Streaming Services", "Social Media", "Website"], 'children': [
+                {'type': 'rect', 'at': [20, '368 + i*50'], 'size': ['W - 40', 40], 'rx': 8, 'fill': 'none', 'stroke': 'border'},
+                {'type': 'circle', 'at': [45, '388 + i*50'], 'r': 15, 'fill': 'surface'},
+                {'type': 'text', 'text': '{item}', 'at': [70, '393 + i*50'], 'fill': 'text', 'style': 'subhead'}
+            ]},
+            {'type': 'button', 'label': "Generate Preview", 'link': 'analytics_dashboard'}
+        ]
+    },
+    'analytics_dashboard': {
+        'title': "Analytics & Revenue",
+        'back': 'release_management',
+        'next': 'community_hub',
+        'items': [
+            {'type': 'text', 'text': "Revenue Overview", 'at': [20, 108], 'fill': 'text', 'style': 'headline'},
+            # Revenue card
+            {'type': 'rect', 'at': [20, 128], 'size': ['W - 40', 100], 'rx': 8, 'fill': 'surface'},
+            {'type': 'text', 'text': "$1,234", 'at': [40, 178], 'fill': 'text', 'style': 'figure'},
+            {'type': 'text', 'text': "This Month", 'at': [40, 198], 'fill': 'secondary', 'style': 'footnote'},
+            {'type': 'text', 'text': "Performance Metrics", 'at': [20, 248], 'fill': 'text', 'style': 'subhead'},
+            {'type': 'stack', 'each': ["Streams", "Engagement", "Growth"], 'children': [
+                {'type': 'rect', 'at': [20, '268 + i*80'], 'size': ['W - 40', 60], 'rx': 8, 'fill': 'surface'},
+                {'type': 'text', 'text': '{item}', 'at': [40, '298 + i*80'], 'fill': 'text', 'style': 'subhead'},
+                {'type': 'slot', 'param': 'series', 'draw': 'chart',
+                 'args': {'metric': 'item', 'x': 50, 'y': '283 + i*80', 'width': 'W - 110', 'height': 35}, 'children': [
+                    # Placeholder chart line
+                    {'type': 'path', 'd': 'M {50} {308 + i*80} C {150} {288 + i*80}, {200} {318 + i*80}, {W - 60} {298 + i*80}',
+                     'stroke': 'primary', 'fill': 'none', 'stroke_width': 2}
+                ]}
+            ]}
+        ]
+    },
+    'community_hub': {
+        'title': "Community Hub",
+        'back': 'analytics_dashboard',
+        'items': [
+            {'type': 'text', 'text': "Recent Messages", 'at': [20, 108], 'fill': 'text', 'style': 'headline'},
+            {'type': 'list', 'param': 'messages', 'top': 128, 'bottom': 338, 'pitch': 70,
+             'count': 3, 'fields': ['sender', 'preview'],
+             'defaults': {'sender': "Fan {n}", 'preview': "Message preview..."}, 'row': [
+                {'type': 'rect', 'at': [20, 'y'], 'size': ['W - 40', 60], 'rx': 8, 'fill': 'surface',
+                 'link': 'message_thread'},
+                # User avatar
+                {'type': 'circle', 'at': [50, 'y + 30'], 'r': 20, 'fill': 'avatar'},
+                {'type': 'text', 'text': '{sender}', 'at': [80, 'y + 25'], 'fill': 'text', 'style': 'subhead-strong'},
+                {'type': 'text', 'text': '{preview}', 'at': [80, 'y + 45'], 'fill': 'secondary', 'style': 'footnote'}
+            ]},
+            {'type': 'text', 'text': "Community Stats", 'at': [20, 348], 'fill': 'text', 'style': 'subhead'},
+            {'type': 'stack', 'each': [
+                {'label': "Followers", 'value': "1.2K"},
+                {'label': "Messages", 'value': "156"},
+                {'label': "Events", 'value': "3"}
+            ], 'children': [
+                {'type': 'rect', 'at': ['20 + i*(W/3 - 20)', 368], 'size': ['W/3 - 30', 80], 'rx': 8, 'fill': 'surface'},
+                {'type': 'text', 'text': '{value}', 'at': ['20 + i*(W/3 - 20) + (W/3 - 30)/2', 408], 'anchor': 'middle',
+                 'fill': 'text', 'style': 'figure'},
+                {'type': 'text', 'text': '{label}', 'at': ['20 + i*(W/3 - 20) + (W/3 - 30)/2', 428], 'anchor': 'middle',
+                 'fill': 'secondary', 'style': 'footnote'}
+            ]},
+            {'type': 'button', 'label': "Compose Message", 'link': 'compose_message'}
+        ]
+    }
+}
+
+
+class PlanRecorder:
+    """Stands in for a drawing while a spec compiles
+
+    Element factories return (factory, args, extra) calls instead of
+    elements and add() collects them, so the regular drawing helpers
+    (nav bar, symbols, frame) compile into plans unchanged. Items with
+    a 'link' leave ((x, y, width, height), target screen) in hotspots.
+    """
+    def __init__(self):
+        self.ops = []
+        self.hotspots = []
+
+    def add(self, op):
+        self.ops.append(op)
+        return op
+
+    def __getattr__(self, factory):
+        return lambda *args, **extra: (factory, args, extra)
+
+
+class PlanSlot:
+    """Dynamic part of a render plan, filled from the build parameters"""
+    def __init__(self, spec, env, default):
+        self.spec = spec
+        self.env = env
+        self.param = spec['param']
+        # Compiled children, drawn when the parameter is missing
+        self.default = default
+
+
+class HotspotGrid:
+    """Uniform grid over a screen that maps a point to a link target
+
+    Each cell lists the hotspots overlapping it, so a lookup computes
+    the cell and checks the few boxes in it, whatever the hotspot
+    count. Later hotspots are drawn on top and win.
+    """
+    CELL = 40
+
+    def __init__(self, width, height, hotspots, cell=CELL):
+        self.cell = cell
+        self.columns = max(1, math.ceil(width / cell))
+        self.rows = max(1, math.ceil(height / cell))
+        self.hotspots = list(hotspots)
+        self.cells = [[] for _ in range(self.columns * self.rows)]
+        for index, ((x, y, w, h), _) in enumerate(self.hotspots):
+            for row in range(max(0, int(y // cell)), min(self.rows, math.ceil((y + h) / cell))):
+                for col in range(max(0, int(x // cell)), min(self.columns, math.ceil((x + w) / cell))):
+                    self.cells[row*self.columns + col].append(index)
+
+    def lookup(self, x, y):
+        """Target screen of the hotspot at (x, y), or None"""
+        col, row = int(x // self.cell), int(y // self.cell)
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return None
+        for index in reversed(self.cells[row*self.columns + col]):
+            (left, top, w, h), target = self.hotspots[index]
+            if left <= x < left + w and top <= y < top + h:
+                return target
+        return None
+
+    def as_dict(self):
+        """JSON-ready form, for doing the lookup in the browser"""
+        return {
+            'cell': self.cell,
+            'columns': self.columns,
+            'cells': self.cells,
+            'hotspots': [[*box, target] for box, target in self.hotspots]
+        }
+
+
+class LayoutDiverges(Exception):
+    """A layout decision comes out differently across a DeviceBatch"""
+
+
+class DeviceValues:
+    """A number with one value per device, for laying out many at once
+
+    Arithmetic runs elementwise on NumPy arrays, so a spec compiled with
+    W and H as DeviceValues computes every coordinate for all devices
+    in one pass. Formatted into markup it becomes a placeholder token
+    (see DeviceBatch). Comparisons, truth tests and repr() only work
+    while all devices agree, otherwise they raise LayoutDiverges.
+    """
+    # Keep NumPy from broadcasting over us in reflected operations
+    __array_ufunc__ = None
+
+    def __init__(self, values, registry):
+        self.values = values
+        # Shared by a batch: token number -> DeviceValues
+        self.registry = registry
+        self.token = None
+
+    def _operand(self, other):
+        return other.values if isinstance(other, DeviceValues) else other
+
+    def _agree(self, results):
+        if results.all():
+            return True
+        if not results.any():
+            return False
+        raise LayoutDiverges(f"devices disagree for {self.values.tolist()}")
+
+    def uniform(self):
+        """The value all devices share"""
+        first = self.values[0].item()
+        if (self.values != first).any():
+            raise LayoutDiverges(f"devices disagree for {self.values.tolist()}")
+        return first
+
+    def __format__(self, spec):
+        if spec:
+            return format(self.uniform(), spec)
+        if self.token is None:
+            self.token = f'\x00{len(self.registry)}\x00'
+            self.registry.append(self)
+        return self.token
+
+    def __str__(self):
+        return format(self, '')
+
+    def __repr__(self):
+        return repr(self.uniform())
+
+    def __hash__(self):
+        return hash(self.uniform())
+
+    def __bool__(self):
+        return self._agree(self.values != 0)
+
+    def __int__(self):
+        return int(self.uniform())
+
+    def __float__(self):
+        return float(self.uniform())
+
+    def __round__(self, ndigits=None):
+        return round(self.uniform(), ndigits)
+
+    def __neg__(self):
+        return DeviceValues(-self.values, self.registry)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return DeviceValues(abs(self.values), self.registry)
+
+    def __eq__(self, other):
+        return self._agree(self.values == self._operand(other))
+
+    def __ne__(self, other):
+        return self._agree(self.values != self._operand(other))
+
+    def __lt__(self, other):
+        return self._agree(self.values < self._operand(other))
+
+    def __le__(self, other):
+        return self._agree(self.values <= self._operand(other))
+
+    def __gt__(self, other):
+        return self._agree(self.values > self._operand(other))
+
+    def __ge__(self, other):
+        return self._agree(self.values >= self._operand(other))
+
+
+def _device_operator(op, reflected=False):
+    if reflected:
+        return lambda self, other: DeviceValues(op(other, self.values), self.registry)
+    return lambda self, other: DeviceValues(op(self.values, self._operand(other)), self.registry)
+
+
+for _name in ('add', 'sub', 'mul', 'truediv', 'floordiv', 'mod'):
+    _op = getattr(operator, _name)
+    setattr(DeviceValues, f'__{_name}__', _device_operator(_op))
+    setattr(DeviceValues, f'__r{_name}__', _device_operator(_op, reflected=True))
+
+
+def per_device(func, value):
+    """func(value); for DeviceValues, func of each device's value if all agree"""
+    if not isinstance(value, DeviceValues):
+        return func(value)
+    results = [func(v) for v in value.values.tolist()]
+    if any(result != results[0] for result in results):
+        raise LayoutDiverges(f"{func} differs across devices")
+    return results[0]
+
+
+class AthleteAppWireframes:
+    # Screen name -> builder method
+    SCREENS = {
+        'welcome': 'create_verification_welcome',
+        'league_selection': 'create_league_selection',
+        'document_upload': 'create_document_upload_screen',
+        'profile_setup': 'create_profile_setup',
+        'studio_dashboard': 'create_studio_dashboard_screen',
+        'daw': 'create_daw_screen',
+        'content_management': 'create_content_management_screen',
+        'release_management': 'create_release_management_screen',
+        'analytics_dashboard': 'create_analytics_dashboard_screen',
+        'community_hub': 'create_community_hub_screen'
+    }
+
+    # Shared primitives that symbol mode defines once per page
+    SYMBOLS = ('frame', 'back', 'button')
+
+    # Screen name -> spec; screens without a create_* method render too
+    SPECS = SCREEN_SPECS
+
+    # Measure text against the screen while compiling specs
+    check_overflow = True
+
+    def __init__(self, backend='svgwrite', symbols=False, css_classes=False,
+                 theme='light', css_vars=False, screen_width=360, screen_height=640):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+        self.backend = backend
+        # Reference the phone frame, back arrow and primary button via <use>
+        self.symbols = symbols
+        # Replace inline text styles and palette colors with classes
+        self.css_classes = css_classes or css_vars
+        # Color classes read CSS variables, so the theme lives outside the SVG
+        self.css_vars = css_vars
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.padding = 20
         
-        y += 40
-        for doc in documents:
-            # Document label
-            dwg.add(dwg.text(
-                doc,
-                insert=(20, y),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            
-            # Upload area
-            dwg.add(dwg.rect(
-                (20, y + 10),
-                (self.screen_width - 40, 80),
-                rx=8, ry=8,
-                fill='none',
-                stroke=self.colors['border'],
-                stroke_dasharray='5,5'
-            ))
-            
-            # Upload icon and text
-            dwg.add(dwg.text(
-                "Tap to Upload",
-                insert=(self.screen_width/2, y + 50),
-                text_anchor='middle',
-                fill=self.colors['primary'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            
-            y += 110
-        
-        # Submit button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Submit Documents",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
+        # Colors from journey map
+        self.theme = dict(THEMES[theme] if isinstance(theme, str) else theme)
+        # What the builders draw with; in css_vars mode var(--lofi-<role>)
+        # references, which keeps screens (and cache keys) theme-independent
+        self.colors = theme_vars(self.theme) if css_vars else dict(self.theme)
+        # Screen name -> compiled render plan, text that overflows in it,
+        # its link hotspots and their HotspotGrid
+        self.plans = {}
+        self.overflows = {}
+        self.hotspots = {}
+        self.grids = {}
+
+    def cache_key(self, name):
+        """Key for a screen: its name plus everything the builders read
+
+        The backend is left out on purpose, both produce identical markup.
+        """
+        return (
+            name,
+            self.screen_width,
+            self.screen_height,
+            self.padding,
+            tuple(sorted(self.colors.items())),
+            self.symbols,
+            self.css_classes
+        )
+
+    def render_key(self, name, standalone=False):
+        """Render cache key render(name, standalone) stores the screen under"""
+        standalone = standalone and (self.symbols or self.css_classes)
+        key = self.cache_key(name) + (standalone,)
+        if standalone and self.css_vars:
+            key += tuple(sorted(self.theme.items()))
+        return key
+
+    def render(self, name, standalone=False):
+        """Return the SVG markup for a screen, served from the render cache
+
+        In symbol and class modes the markup relies on symbol_defs() and
+        page_styles() being on the page, unless standalone is set, which
+        inlines the symbols and stylesheet into the screen.
+        """
+        if name in self.SCREENS:
+            builder = getattr(self, self.SCREENS[name])
+        else:
+            builder = functools.partial(self.build_screen, name)
+        standalone = standalone and (self.symbols or self.css_classes)
+        key = self.render_key(name, standalone)
+
+        def build():
+            dwg = builder()
+            if standalone and self.symbols:
+                self.add_symbol_defs(dwg)
+            if standalone and self.css_classes:
+                css = self.stylesheet().css()
+                if self.css_vars:
+                    css = self.theme_rules() + css
+                dwg.defs.add(dwg.style(css))
+            start = time.perf_counter()
+            svg = dwg.tostring()
+            if render_stats.enabled:
+                render_stats.record(name, 'serialize', (time.perf_counter() - start) * 1000)
+                render_stats.record_output(name, svg)
+            return svg
+
+        return render_cache.get_or_render(key, build)
+
+    def fingerprint(self, name):
+        """Digest of everything a screen's markup depends on, code included"""
+        inputs = repr((self.cache_key(name), tuple(sorted(self.theme.items()))))
+        return hashlib.sha256(f'{source_fingerprint()}:{inputs}'.encode()).hexdigest()
+
+    def screen_for(self, method_name):
+        """Screen name built by a create_* method (the method name if none)"""
+        for name, method in self.SCREENS.items():
+            if method == method_name:
+                return name
+        return method_name
+
+    def new_drawing(self, size, **extra):
+        """Create an empty drawing with the configured backend and modes"""
+        dwg = BACKENDS[self.backend](size=size, **extra)
+        if self.css_classes:
+            dwg = ClassedDrawing(dwg, self.stylesheet())
         return dwg
 
-    def create_league_selection(self):
-        """Create league selection screen wireframe"""
-        dwg = self.create_base_screen("league_selection")
-        self.add_nav_bar(dwg, "League Selection")
-        
-        # Form fields
-        y = 108
-        fields = [
-            {"label": "Select League", "type": "dropdown", "placeholder": "Choose your league"},
-            {"label": "Select Team", "type": "dropdown", "placeholder": "Choose your team"},
-            {"label": "Player ID", "type": "input", "placeholder": "Enter your ID"}
-        ]
-        
-        for field in fields:
-            # Label
-            dwg.add(dwg.text(
-                field["label"],
-                insert=(20, y),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            
-            # Input/Dropdown field
-            dwg.add(dwg.rect(
-                (20, y + 10),
-                (self.screen_width - 40, 44),
-                rx=8, ry=8,
-                fill='none',
-                stroke=self.colors['border']
-            ))
-            
-            # Placeholder text
-            dwg.add(dwg.text(
-                field["placeholder"],
-                insert=(35, y + 35),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            
-            # Add dropdown arrow for dropdown fields
-            if field["type"] == "dropdown":
-                dwg.add(dwg.path(
-                    d=f'M {self.screen_width - 45} {y + 30} l 6 -6 l 6 6',
-                    stroke=self.colors['border'],
-                    fill='none'
-                ))
-            
-            y += 80
-        
-        # Help text
-        dwg.add(dwg.text(
-            "This information will be verified with your league",
-            insert=(20, y + 10),
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 13px'
-        ))
-        
-        # Continue button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Continue",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # self.screens['League Selection'] = dwg
+    def stylesheet(self):
+        return StyleSheet(self.colors)
+
+    def page_styles(self):
+        """<style> block for class mode, emitted once per page"""
+        return f'<style>{self.stylesheet().css()}</style>'
+
+    def theme_rules(self, theme=None, selector=':root'):
+        """CSS variable declarations for a palette (default: self.theme)"""
+        theme = self.theme if theme is None else theme
+        declarations = ';'.join(f'--lofi-{role}:{value}' for role, value in theme.items())
+        return f'{selector}{{{declarations}}}'
+
+    def theme_css(self, theme=None, selector=':root'):
+        """<style> block that applies a palette to css_vars screens
+
+        Swapping themes only means sending a different one of these;
+        the screens themselves stay cached and unchanged. A selector
+        other than :root scopes the palette to part of the page.
+        """
+        if isinstance(theme, str):
+            theme = THEMES[theme]
+        return f'<style>{self.theme_rules(theme, selector)}</style>'
 
+    def symbol_id(self, kind):
+        """Page-unique id of a shared symbol for this geometry and palette"""
+        digest = hashlib.sha1(repr(self.cache_key('')).encode()).hexdigest()[:8]
+        return f'lofi-{kind}-{digest}'
+
+    def add_symbol_defs(self, dwg):
+        """Define the shared symbols in the drawing's <defs>"""
+        drawers = {
+            'frame': self.draw_phone_frame,
+            'back': self.draw_back_arrow,
+            'button': self.draw_primary_button_shape
+        }
+        for kind in self.SYMBOLS:
+            symbol = dwg.symbol(id=self.symbol_id(kind))
+            drawers[kind](dwg, symbol)
+            dwg.defs.add(symbol)
+
+    def symbol_defs(self):
+        """Zero-size SVG holding the shared symbols, emitted once per page"""
+        def build():
+            dwg = self.new_drawing((0, 0), style='position: absolute')
+            self.add_symbol_defs(dwg)
+            return dwg.tostring()
+
+        return render_cache.get_or_render(self.cache_key('__symbols__'), build)
+
+    def add_symbol(self, dwg, kind):
+        """Reference a shared symbol from the screen"""
+        dwg.add(dwg.use(f'#{self.symbol_id(kind)}'))
+
+    def create_base_screen(self, name):
+        """Create base screen with iPhone frame"""
+        dwg = self.new_drawing((self.screen_width, self.screen_height))
+        self.add_base_screen(dwg)
         return dwg
 
-    def create_profile_setup(self):
-        """Create profile setup screen"""
-        dwg = self.create_base_screen("profile_setup")
-        self.add_nav_bar(dwg, "Profile Setup")
-        
-        # Profile photo section
-        y = 108
-        dwg.add(dwg.circle(
-            (self.screen_width/2, y + 50),
-            40,
-            fill=self.colors['surface'],
-            stroke=self.colors['border']
-        ))
-        dwg.add(dwg.text(
-            "Add Photo",
-            insert=(self.screen_width/2, y + 110),
-            text_anchor='middle',
-            fill=self.colors['primary'],
-            style='font-family: SF Pro Text; font-size: 15px'
+    @instrumented('base')
+    def add_base_screen(self, dwg):
+        """Add the iPhone frame to a screen"""
+        if self.symbols:
+            self.add_symbol(dwg, 'frame')
+        else:
+            self.draw_phone_frame(dwg, dwg)
+
+    def draw_phone_frame(self, dwg, parent):
+        """Draw phone frame, status bar and notch into parent"""
+        # Phone frame
+        parent.add(dwg.rect(
+            (0, 0),
+            (self.screen_width, self.screen_height),
+            rx=40, ry=40,
+            fill=self.colors['background'],
+            stroke=self.colors['border'],
+            stroke_width=2
         ))
         
-        # Form fields
-        y += 140
-        fields = [
-            {"label": "Professional Bio", "type": "textarea"},
-            {"label": "Career Highlights", "type": "input"},
-            {"label": "Social Media Links", "type": "input"}
-        ]
-        
-        for field in fields:
-            dwg.add(dwg.text(
-                field["label"],
-                insert=(20, y),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-            
-            height = 80 if field["type"] == "textarea" else 44
-            dwg.add(dwg.rect(
-                (20, y + 10),
-                (self.screen_width - 40, height),
-                rx=8, ry=8,
-                fill='none',
-                stroke=self.colors['border']
-            ))
-            
-            y += height + 20
+        # Status bar
+        parent.add(dwg.rect(
+            (0, 0),
+            (self.screen_width, 44),
+            fill=self.colors['surface']
+        ))
         
-        return dwg
+        # Notch
+        parent.add(dwg.rect(
+            (self.screen_width/2 - 60, 0),
+            (120, 30),
+            rx=15, ry=15,
+            fill=self.colors['notch']
+        ))
 
-    def create_studio_dashboard_screen(self):
-        """Create music studio dashboard screen"""
-        dwg = self.create_base_screen("studio_dashboard")
-        self.add_nav_bar(dwg, "Studio")
-        
-        # Tab bar
-        y = 88
-        tabs = ['DAW', 'Beats', 'Projects']
-        tab_width = self.screen_width / len(tabs)
-        for i, tab in enumerate(tabs):
-            # Tab background
-            dwg.add(dwg.rect(
-                (i * tab_width, y),
-                (tab_width, 44),
-                fill=self.colors['surface'] if i == 0 else 'none',
-                stroke=self.colors['border']
-            ))
-            # Tab text
-            dwg.add(dwg.text(
-                tab,
-                insert=(i * tab_width + tab_width/2, y + 28),
-                text_anchor='middle',
-                fill=self.colors['primary'] if i == 0 else self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-        
-        # Recent Projects section
-        y = 152
-        dwg.add(dwg.text(
-            "Recent Projects",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+    def draw_back_arrow(self, dwg, parent):
+        """Draw the nav bar back arrow into parent"""
+        parent.add(dwg.path(
+            d=f'M 20,66 L 35,58 L 35,74 Z',
+            fill=self.colors['primary']
         ))
-        
-        # Project grid
-        y += 20
-        for row in range(2):
-            for col in range(2):
-                dwg.add(dwg.rect(
-                    (20 + col*(self.screen_width/2 - 30), y + row*120),
-                    ((self.screen_width/2 - 40), 100),
-                    rx=8, ry=8,
-                    fill=self.colors['surface']
-                ))
-                # Project title
-                dwg.add(dwg.text(
-                    f"Project {row*2 + col + 1}",
-                    insert=(30 + col*(self.screen_width/2 - 30), y + row*120 + 30),
-                    fill=self.colors['text'],
-                    style='font-family: SF Pro Text; font-size: 15px'
-                ))
-        
-        # New Recording button
-        dwg.add(dwg.rect(
+
+    def draw_primary_button_shape(self, dwg, parent):
+        """Draw the full-width rounded button at the bottom into parent"""
+        parent.add(dwg.rect(
             (20, self.screen_height - 80),
             (self.screen_width - 40, 50),
             rx=25, ry=25,
             fill=self.colors['primary']
         ))
-        dwg.add(dwg.text(
-            "New Recording",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # self.screens['Studio Dashboard'] = dwg
-        return dwg
 
-    def create_daw_screen(self):
-        """Create DAW interface screen"""
-        dwg = self.create_base_screen("daw")
-        self.add_nav_bar(dwg, "Recording")
-        
-        # Waveform area
-        y = 108
+    @instrumented('nav')
+    def add_nav_bar(self, dwg, title, show_back=True):
+        """Add navigation bar to screen"""
+        # Nav bar background
         dwg.add(dwg.rect(
-            (20, y),
-            (self.screen_width - 40, 200),
-            fill=self.colors['surface']
+            (0, 44),
+            (self.screen_width, 44),
+            fill=self.colors['background']
         ))
         
-        # Track lanes
-        for i in range(4):
-            # Track number
-            dwg.add(dwg.text(
-                f"Track {i+1}",
-                insert=(25, y + 30 + i*50),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 12px'
-            ))
-            # Track line
-            dwg.add(dwg.line(
-                (70, y + 25 + i*50),
-                (self.screen_width - 30, y + 25 + i*50),
-                stroke=self.colors['border']
-            ))
-            # Mute/Solo buttons
-            dwg.add(dwg.rect(
-                (20, y + 10 + i*50),
-                (20, 20),
-                fill='none',
-                stroke=self.colors['border']
-            ))
-        
-        # Transport controls
-        y += 220
-        controls = ['Record', 'Play', 'Stop', 'Mix']
-        for i, control in enumerate(controls):
-            # Control button
-            dwg.add(dwg.circle(
-                (60 + i*80, y + 30),
-                25,
-                fill='none',
-                stroke=self.colors['primary'] if control == 'Record' else self.colors['border'],
-                stroke_width=2
-            ))
-            # Control label
-            dwg.add(dwg.text(
-                control,
-                insert=(60 + i*80, y + 70),
-                text_anchor='middle',
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        # self.screens['DAW Interface'] = dwg
-        return dwg
-
-    def create_content_management_screen(self):
-        """Create content management screen wireframe"""
-        dwg = self.create_base_screen("content_management")
-        self.add_nav_bar(dwg, "Content Management")
-        
-        # Upload section
-        y = 108
-        dwg.add(dwg.text(
-            "Upload Tracks",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
+        # Back button if needed
+        if show_back:
+            if self.symbols:
+                self.add_symbol(dwg, 'back')
+            else:
+                self.draw_back_arrow(dwg, dwg)
         
-        # Upload area
-        dwg.add(dwg.rect(
-            (20, y + 20),
-            (self.screen_width - 40, 120),
-            rx=8, ry=8,
-            fill='none',
-            stroke=self.colors['border'],
-            stroke_dasharray='5,5'
-        ))
+        # Title
         dwg.add(dwg.text(
-            "Drag and drop tracks here",
-            insert=(self.screen_width/2, y + 70),
+            title,
+            insert=(self.screen_width/2, 74),
             text_anchor='middle',
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        # Track list
-        y += 160
-        dwg.add(dwg.text(
-            "Recent Uploads",
-            insert=(20, y),
             fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + 20 + i*60),
-                (self.screen_width - 40, 50),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            dwg.add(dwg.text(
-                f"Track {i+1}",
-                insert=(40, y + 50 + i*60),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
-            ))
-        
-        # Distribution button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
+            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
         ))
+
+    def add_primary_button(self, dwg, label):
+        """Add the full-width primary button at the bottom of the screen"""
+        if self.symbols:
+            self.add_symbol(dwg, 'button')
+        else:
+            self.draw_primary_button_shape(dwg, dwg)
         dwg.add(dwg.text(
-            "Set Distribution",
+            label,
             insert=(self.screen_width/2, self.screen_height - 45),
             text_anchor='middle',
-            fill='white',
+            fill=self.colors['on_primary'],
             style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
         ))
-        
-        # self.screens['Content Management'] = dwg
-        return dwg
 
-    def create_release_management_screen(self):
-        """Create release management screen wireframe"""
-        dwg = self.create_base_screen("release_management")
-        self.add_nav_bar(dwg, "Release Management")
-        
-        # Calendar section
-        y = 108
-        dwg.add(dwg.text(
-            "Release Schedule",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # Calendar grid
-        dwg.add(dwg.rect(
-            (20, y + 20),
-            (self.screen_width - 40, 200),
-            rx=8, ry=8,
-            fill=self.colors['surface']
-        ))
-        
-        # Distribution options
-        y += 240
-        dwg.add(dwg.text(
-            "Distribution Channels",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
-        ))
-        
-        channels = ['Streaming Services', 'Social Media', 'Website']
-        for i, channel in enumerate(channels):
+    def add_scrolling_list(self, dwg, key, rows, top, bottom, pitch, scroll, draw_row):
+        """Add only the list rows visible between top and bottom
+
+        rows is the row count and pitch the distance between row tops;
+        draw_row(parent, index, y) draws row index with its top at y.
+        Rows are clipped to the viewport and a scroll indicator shows
+        where it is, so the cost follows the viewport, not the row count.
+        """
+        view = bottom - top
+        content = rows * pitch
+        scroll = max(0, min(scroll, content - view))
+        clip = dwg.clipPath(id=f'lofi-{key}-clip')
+        clip.add(dwg.rect((0, top), (self.screen_width, view)))
+        dwg.defs.add(clip)
+        group = dwg.add(dwg.g(clip_path=f'url(#lofi-{key}-clip)'))
+        first = int(scroll // pitch)
+        last = min(rows, math.ceil((scroll + view) / pitch))
+        for index in range(first, last):
+            draw_row(group, index, top + index*pitch - scroll)
+
+        if content > view:
+            thumb = max(20, view * view / content)
             dwg.add(dwg.rect(
-                (20, y + 20 + i*50),
-                (self.screen_width - 40, 40),
-                rx=8, ry=8,
-                fill='none',
-                stroke=self.colors['border']
-            ))
-            # Channel icon placeholder
-            dwg.add(dwg.circle(
-                (45, y + 40 + i*50),
-                15,
-                fill=self.colors['surface']
-            ))
-            # Channel name
-            dwg.add(dwg.text(
-                channel,
-                insert=(70, y + 45 + i*50),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px'
+                (self.screen_width - 16, top + (view - thumb) * scroll / (content - view)),
+                (4, thumb),
+                rx=2, ry=2,
+                fill=self.colors['secondary']
             ))
-        
-        # Preview button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Generate Preview",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # self.screens['Release Management'] = dwg
-        return dwg
 
-    def create_analytics_dashboard_screen(self):
-        """Create analytics dashboard screen wireframe"""
-        dwg = self.create_base_screen("analytics_dashboard")
-        self.add_nav_bar(dwg, "Analytics & Revenue")
-        
-        # Revenue Overview
-        y = 108
+    def add_field(self, dwg, label, y, height=44, placeholder='', dropdown=False):
+        """Add a form field: label at y, input box below, optional placeholder"""
         dwg.add(dwg.text(
-            "Revenue Overview",
+            label,
             insert=(20, y),
             fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+            style='font-family: SF Pro Text; font-size: 15px'
         ))
-        
-        # Revenue card
         dwg.add(dwg.rect(
-            (20, y + 20),
-            (self.screen_width - 40, 100),
+            (20, y + 10),
+            (self.screen_width - 40, height),
             rx=8, ry=8,
-            fill=self.colors['surface']
-        ))
-        dwg.add(dwg.text(
-            "$1,234",
-            insert=(40, y + 70),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 24px; font-weight: bold'
-        ))
-        dwg.add(dwg.text(
-            "This Month",
-            insert=(40, y + 90),
-            fill=self.colors['secondary'],
-            style='font-family: SF Pro Text; font-size: 13px'
-        ))
-        
-        # Analytics charts
-        y += 140
-        dwg.add(dwg.text(
-            "Performance Metrics",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
+            fill='none',
+            stroke=self.colors['border']
         ))
-        
-        # Chart placeholders
-        metrics = ['Streams', 'Engagement', 'Growth']
-        for i, metric in enumerate(metrics):
-            dwg.add(dwg.rect(
-                (20, y + 20 + i*80),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
+        if placeholder:
             dwg.add(dwg.text(
-                metric,
-                insert=(40, y + 50 + i*80),
-                fill=self.colors['text'],
+                placeholder,
+                insert=(35, y + 35),
+                fill=self.colors['secondary'],
                 style='font-family: SF Pro Text; font-size: 15px'
             ))
-            # Fake chart line
+        if dropdown:
             dwg.add(dwg.path(
-                d=f'M {50} {y + 60 + i*80} C {150} {y + 40 + i*80}, {200} {y + 70 + i*80}, {self.screen_width - 60} {y + 50 + i*80}',
-                stroke=self.colors['primary'],
-                fill='none',
-                stroke_width=2
+                d=f'M {self.screen_width - 45} {y + 30} l 6 -6 l 6 6',
+                stroke=self.colors['border'],
+                fill='none'
             ))
-        
-        # self.screens['Analytics Dashboard'] = dwg
+
+    def compile_screen(self, name):
+        """Return the render plan for a screen, compiling its spec once
+
+        The spec is laid out with this instance's size, palette and modes
+        into the element calls it makes. Calls the backend serializes to
+        strings are run once and joined into fragments, the rest are kept
+        to replay; slots and lists stay dynamic (PlanSlot).
+        """
+        plan = self.plans.get(name)
+        if plan is None:
+            # Charges the base and nav phases to this screen, also when
+            # compiled outside a build (the journey graph's links)
+            local = render_stats._local
+            outer = render_stats.current_screen
+            local.screen = name
+            try:
+                plan = self._compile_screen(name)
+            finally:
+                local.screen = outer
+        return plan
+
+    def _compile_screen(self, name):
+        spec = self.SPECS[name]
+        recorder = PlanRecorder()
+        self.add_base_screen(recorder)
+        back = spec.get('back', True)
+        self.add_nav_bar(recorder, spec['title'], show_back=back)
+        if isinstance(back, str):
+            # 'back' may name the screen the arrow leads to
+            recorder.hotspots.append(((10, 48, 40, 36), back))
+        if spec.get('next'):
+            recorder.hotspots.append(((50, 48, self.screen_width - 100, 36), spec['next']))
+        overflows = [] if self.check_overflow else None
+        # The centered title has to clear the back arrow on both sides
+        width = text_width(spec['title'], TEXT_STYLES['headline'])
+        room = self.screen_width - 2 * (45 if back else self.padding)
+        self.flag_overflow(overflows, spec['title'], width, room)
+        env = {'W': self.screen_width, 'H': self.screen_height}
+        self.compile_items(recorder, spec['items'], env, overflows)
+        self.overflows[name] = overflows or []
+        self.hotspots[name] = recorder.hotspots
+        if render_stats.enabled and overflows:
+            render_stats.record_overflows(name, overflows)
+        plan = self.plans[name] = self.freeze_plan(recorder.ops, self.new_drawing((0, 0)))
+        return plan
+
+    def compile_items(self, dwg, items, env, overflows=None):
+        """Add spec items to dwg, a PlanRecorder, with env's variables
+
+        Text that doesn't fit is appended to overflows, when given.
+        Items with a 'link' add their box to dwg's hotspots.
+        """
+        for item in items:
+            kind = item['type']
+            if 'link' in item:
+                target = spec_text(item['link'], env)
+                if target:
+                    dwg.hotspots.append((self.item_box(item, env), target))
+            if kind == 'text':
+                for line, insert in self.layout_text(item, env, overflows):
+                    dwg.add(self.spec_element(dwg, item, env, line, insert))
+            elif kind in ('rect', 'circle', 'line', 'path'):
+                dwg.add(self.spec_element(dwg, item, env))
+            elif kind == 'field':
+                self.add_field(
+                    dwg,
+                    spec_text(item['label'], env),
+                    spec_value(item['y'], env),
+                    spec_value(item.get('height', 44), env),
+                    spec_text(item.get('placeholder', ''), env),
+                    spec_value(item.get('dropdown', False), env)
+                )
+            elif kind == 'button':
+                self.add_primary_button(dwg, spec_text(item['label'], env))
+            elif kind == 'stack':
+                for local in self.stack_layout(item, env)[0]:
+                    self.compile_items(dwg, item['children'], local, overflows)
+            elif kind == 'flow':
+                for child, local in self.flow_layout(item, env)[0]:
+                    self.compile_items(dwg, [child], local, overflows)
+            elif kind in ('slot', 'list'):
+                default = PlanRecorder()
+                if kind == 'slot':
+                    self.compile_items(default, item['children'], env, overflows)
+                else:
+                    self.compile_rows(default, item, env, [None] * item.get('count', 0), 0, overflows=overflows)
+                dwg.add(PlanSlot(item, env, default.ops))
+                dwg.hotspots.extend(default.hotspots)
+            else:
+                raise ValueError(f"Unknown spec item type {kind!r}")
+
+    def spec_element(self, dwg, item, env, text=None, insert=None):
+        """Create the element for a rect, circle, line, path or text item
+
+        text and insert, when given, replace a text item's own (one line
+        of wrapped text).
+        """
+        kind = item['type']
+        extra = {}
+        for key in ('fill', 'stroke'):
+            if key in item:
+                color = spec_text(item[key], env)
+                extra[key] = self.colors.get(color, color)
+        for key in ('stroke_width', 'stroke_dasharray'):
+            if key in item:
+                extra[key] = item[key]
+        if kind == 'rect':
+            if 'rx' in item:
+                extra['rx'] = extra['ry'] = spec_value(item['rx'], env)
+            return dwg.rect(spec_value(item['at'], env), spec_value(item['size'], env), **extra)
+        if kind == 'circle':
+            return dwg.circle(spec_value(item['at'], env), spec_value(item['r'], env), **extra)
+        if kind == 'line':
+            return dwg.line(spec_value(item['from'], env), spec_value(item['to'], env), **extra)
+        if kind == 'path':
+            return dwg.path(d=spec_text(item['d'], env), **extra)
+        if 'anchor' in item:
+            extra['text_anchor'] = item['anchor']
+        if 'style' in item:
+            extra['style'] = TEXT_STYLES.get(item['style'], item['style'])
+        if text is None:
+            text, insert = spec_text(item['text'], env), spec_value(item['at'], env)
+        return dwg.text(text, insert=insert, **extra)
+
+    def item_box(self, item, env):
+        """(x, y, width, height) a linked item covers on screen"""
+        kind = item['type']
+        if kind == 'rect':
+            (x, y), (width, height) = spec_value(item['at'], env), spec_value(item['size'], env)
+            return (x, y, width, height)
+        if kind == 'circle':
+            (x, y), r = spec_value(item['at'], env), spec_value(item['r'], env)
+            return (x - r, y - r, 2*r, 2*r)
+        if kind == 'button':
+            return (20, self.screen_height - 80, self.screen_width - 40, 50)
+        if kind == 'text':
+            style = TEXT_STYLES.get(item.get('style'), item.get('style', ''))
+            size, _ = font_metrics(style)
+            lines = self.layout_text(item, env)
+            width = max(text_width(line, style) for line, _ in lines)
+            x, y = spec_value(item['at'], env)
+            x -= {'middle': width / 2, 'end': width}.get(item.get('anchor'), 0)
+            return (x, y - size, width, len(lines) * self.text_leading(item))
+        raise ValueError(f"Spec item type {kind!r} can't be a link")
+
+    def hotspot_grid(self, name):
+        """HotspotGrid of a screen's links, from its compiled render plan"""
+        grid = self.grids.get(name)
+        if grid is None:
+            self.compile_screen(name)
+            grid = self.grids[name] = HotspotGrid(self.screen_width, self.screen_height, self.hotspots[name])
+        return grid
+
+    def text_room(self, x, anchor='start'):
+        """Width available to text at x before it passes the screen padding"""
+        if anchor == 'middle':
+            return 2 * (min(x, self.screen_width - x) - self.padding)
+        if anchor == 'end':
+            return x - self.padding
+        return self.screen_width - self.padding - x
+
+    def layout_text(self, item, env, overflows=None):
+        """Lines of a text item with their insert points
+
+        The text is measured against its 'width', by default the room
+        up to the screen padding. With 'wrap' set it breaks into lines
+        'leading' apart. Lines that still don't fit go to overflows.
+        """
+        text = spec_text(item['text'], env)
+        x, y = spec_value(item['at'], env)
+        if not item.get('wrap') and overflows is None:
+            return [(text, (x, y))]
+        style = TEXT_STYLES.get(item.get('style'), item.get('style', ''))
+        if 'width' in item:
+            room = spec_value(item['width'], env)
+        else:
+            room = self.text_room(x, item.get('anchor', 'start'))
+        if item.get('wrap'):
+            lines = per_device(lambda room: wrap_text(text, style, room), room)
+        else:
+            lines = (text,)
+        placed = []
+        for k, line in enumerate(lines):
+            self.flag_overflow(overflows, line, text_width(line, style), room)
+            placed.append((line, (x, y + k*self.text_leading(item)) if k else (x, y)))
+        return placed
+
+    def flag_overflow(self, overflows, text, width, room):
+        """Append text to overflows (when given) if width exceeds room"""
+        if overflows is not None and width > room:
+            overflows.append({'text': text, 'width': round(width, 1), 'room': round(room, 1)})
+
+    def text_leading(self, item):
+        """Baseline-to-baseline distance of a text item's lines"""
+        if 'leading' in item:
+            return item['leading']
+        size, _ = font_metrics(TEXT_STYLES.get(item.get('style'), item.get('style', '')))
+        return round(size * 1.3)
+
+    def stack_layout(self, item, env):
+        """Variables for each stack entry, and the position after the last"""
+        entries = item['each'] if 'each' in item else [None] * item['count']
+        index, axis = item.get('index', 'i'), item.get('axis', 'y')
+        position = spec_value(item.get('start', 0), env)
+        layout = []
+        for i, entry in enumerate(entries):
+            local = dict(env, **{index: i, 'n': i + 1, axis: position})
+            if isinstance(entry, dict):
+                local.update(entry)
+            elif entry is not None:
+                local['item'] = entry
+            layout.append(local)
+            position += spec_value(item.get('pitch', 0), local)
+        return layout, position
+
+    def flow_layout(self, item, env):
+        """(child, variables) for each child of a flow, and the y after them
+
+        Children go top-down from 'start': each one gets y and the next
+        starts its extent (see item_extent) plus 'gap' further down.
+        """
+        y = spec_value(item.get('start', 'y'), env)
+        gap = spec_value(item.get('gap', 0), env)
+        layout = []
+        for k, child in enumerate(item['children']):
+            if k:
+                y += gap
+            local = dict(env, y=y)
+            layout.append((child, local))
+            y += self.item_extent(child, local)
+        return layout, y
+
+    def item_extent(self, item, env):
+        """Height an item takes in a flow: its 'extent', else measured"""
+        if 'extent' in item:
+            return spec_value(item['extent'], env)
+        kind = item['type']
+        if kind == 'text':
+            return len(self.layout_text(item, env)) * self.text_leading(item)
+        if kind == 'field':
+            return 10 + spec_value(item.get('height', 44), env)
+        if kind == 'stack':
+            return self.stack_layout(item, env)[1] - spec_value(item.get('start', 0), env)
+        if kind == 'flow':
+            return self.flow_layout(item, env)[1] - spec_value(item.get('start', 'y'), env)
+        return 0
+
+    def compile_rows(self, dwg, item, env, entries, first, rows=None, y=None, overflows=None):
+        """Add list rows from row first on, cells from entries
+
+        A row holds 'columns' cells; each gets the entry's fields (an
+        entry may be a value for the first field, a tuple or a dict, or
+        None), with missing ones filled from the list's 'defaults'.
+        """
+        columns = item.get('columns', 1)
+        fields = item.get('fields', ['item'])
+        defaults = item.get('defaults', {})
+        rows = math.ceil(len(entries) / columns) if rows is None else rows
+        top, pitch = spec_value(item['top'], env), spec_value(item['pitch'], env)
+        for row in range(first, first + rows):
+            for col in range(columns):
+                index = row*columns + col
+                if index >= len(entries):
+                    return
+                entry = entries[index]
+                if isinstance(entry, dict):
+                    values = entry
+                elif isinstance(entry, (list, tuple)):
+                    values = dict(zip(fields, entry))
+                else:
+                    values = {} if entry is None else {fields[0]: entry}
+                local = dict(env, i=index, n=index + 1, row=row, col=col)
+                local['y'] = top + row*pitch if y is None else y
+                for field in fields:
+                    local[field] = values[field] if field in values else spec_text(defaults.get(field, ''), local)
+                self.compile_items(dwg, item['row'], local, overflows)
+
+    def freeze_plan(self, ops, dwg):
+        """Serialize the recorded calls that dwg turns into strings"""
+        parts = []
+        for op in ops:
+            if isinstance(op, PlanSlot):
+                op.default = self.freeze_plan(op.default, dwg)
+                parts.append(op)
+                continue
+            factory, args, extra = op
+            element = getattr(dwg, factory)(*args, **extra)
+            if not isinstance(element, str):
+                parts.append(op)
+            elif parts and isinstance(parts[-1], str):
+                parts[-1] += element
+            else:
+                parts.append(element)
+        return parts
+
+    def add_plan(self, dwg, parts, params, parent=None):
+        """Add a render plan's parts to parent (default dwg)
+
+        Slots whose parameter is given in params are filled by their
+        slot_<draw> method or, for lists, fill_list; the rest get their
+        compiled default content.
+        """
+        parent = dwg if parent is None else parent
+        for part in parts:
+            if isinstance(part, str):
+                parent.add(part)
+            elif isinstance(part, PlanSlot):
+                filled = False
+                if params.get(part.param) is not None:
+                    if part.spec['type'] == 'list':
+                        filled = self.fill_list(dwg, part, params)
+                    else:
+                        filled = self.fill_slot(dwg, part, params)
+                if not filled:
+                    self.add_plan(dwg, part.default, params, parent)
+            else:
+                factory, args, extra = part
+                parent.add(getattr(dwg, factory)(*args, **extra))
+
+    def fill_slot(self, dwg, slot, params):
+        """Let a slot's slot_<draw> method draw it, with its args evaluated"""
+        args = {key: spec_value(value, slot.env) for key, value in slot.spec.get('args', {}).items()}
+        return getattr(self, f"slot_{slot.spec['draw']}")(dwg, params, **args)
+
+    def fill_list(self, dwg, slot, params):
+        """Draw the visible rows of a list from params, see add_scrolling_list"""
+        item, env = slot.spec, slot.env
+        entries = params[slot.param]
+        columns = item.get('columns', 1)
+
+        def draw_row(parent, row, y):
+            recorder = PlanRecorder()
+            self.compile_rows(recorder, item, env, entries, row, 1, y)
+            self.add_plan(dwg, recorder.ops, params, parent)
+
+        self.add_scrolling_list(
+            dwg, slot.param, math.ceil(len(entries) / columns),
+            spec_value(item['top'], env), spec_value(item['bottom'], env), spec_value(item['pitch'], env),
+            params.get('scroll', 0), draw_row
+        )
+        return True
+
+    def build_screen(self, name, **params):
+        """Build a screen from its render plan
+
+        params fill the spec's slots and lists (tracks, series, messages,
+        ...); missing or None ones leave the default content.
+        """
+        dwg = self.new_drawing((self.screen_width, self.screen_height))
+        self.add_plan(dwg, self.compile_screen(name), params)
         return dwg
 
-    def create_community_hub_screen(self):
-        """Create community hub screen wireframe"""
-        dwg = self.create_base_screen("community_hub")
-        self.add_nav_bar(dwg, "Community Hub")
-        
-        # Fan Messages section
-        y = 108
-        dwg.add(dwg.text(
-            "Recent Messages",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
+    @instrumented('build')
+    def create_verification_welcome(self):
+        """Create verification welcome screen"""
+        return self.build_screen('welcome')
+
+    @instrumented('build')
+    def create_document_upload_screen(self):
+        """Create document upload screen"""
+        return self.build_screen('document_upload')
+
+    @instrumented('build')
+    def create_league_selection(self):
+        """Create league selection screen wireframe"""
+        return self.build_screen('league_selection')
+
+    @instrumented('build')
+    def create_profile_setup(self):
+        """Create profile setup screen"""
+        return self.build_screen('profile_setup')
+
+    @instrumented('build')
+    def create_studio_dashboard_screen(self, projects=None, scroll=0):
+        """Create music studio dashboard screen
+
+        projects optionally gives the project titles, any sequence; the
+        grid then scrolls by scroll pixels and only visible rows are drawn.
+        """
+        return self.build_screen('studio_dashboard', projects=projects, scroll=scroll)
+
+    @instrumented('build')
+    def create_daw_screen(self, tracks=None, view=None):
+        """Create DAW interface screen
+
+        tracks optionally gives audio per lane (WAV path, raw PCM path or
+        sample array, see open_samples); a raw file read as other than
+        mono '<i2' is given as (path, dtype, channels). Lanes with audio
+        draw its waveform instead of the placeholder line. view is the
+        (start, stop) frame range shown, the whole track by default.
+        """
+        return self.build_screen('daw', tracks=tracks, view=view)
+
+    def add_waveform(self, dwg, source, x, center, width, half_height=15, view=None):
+        """Draw a track's min/max waveform envelope, one column per pixel
+
+        Files go through their PeakPyramid, arrays are decimated directly.
+        """
+        pyramid = None
+        if isinstance(source, tuple) and isinstance(source[0], (str, bytes, os.PathLike)):
+            # (path, dtype, channels) of a raw PCM file
+            pyramid = PeakPyramid.for_file(*source)
+            samples = pyramid.view[0]
+        elif isinstance(source, (str, bytes, os.PathLike)):
+            pyramid = PeakPyramid.for_file(source)
+            samples = pyramid.view[0]
+        else:
+            samples = open_samples(source)
+        # Clamped the same way on both paths; a view past the end draws nothing
+        start, stop = view or (0, None)
+        stop = len(samples) if stop is None else min(stop, len(samples))
+        start = max(0, start)
+        if start >= stop:
+            return
+        if pyramid is not None:
+            mins, maxs = pyramid.peaks(int(width), start, stop)
+        else:
+            mins, maxs = minmax_decimate(samples[start:stop], int(width))
+        dwg.add(dwg.path(
+            d=waveform_path(mins, maxs, x, width, center, half_height),
+            fill=self.colors['primary']
         ))
-        
-        # Message list
-        for i in range(3):
-            dwg.add(dwg.rect(
-                (20, y + 20 + i*70),
-                (self.screen_width - 40, 60),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            # User avatar
-            dwg.add(dwg.circle(
-                (50, y + 50 + i*70),
-                20,
-                fill='#E5E5EA'
-            ))
-            # Message preview
-            dwg.add(dwg.text(
-                f"Fan {i+1}",
-                insert=(80, y + 45 + i*70),
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 15px; font-weight: 600'
-            ))
-            dwg.add(dwg.text(
-                "Message preview...",
-                insert=(80, y + 65 + i*70),
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
-            ))
-        
-        # Community Stats
-        y += 240
-        dwg.add(dwg.text(
-            "Community Stats",
-            insert=(20, y),
-            fill=self.colors['text'],
-            style='font-family: SF Pro Text; font-size: 15px'
+
+    def slot_waveform(self, dwg, params, track, x, center, width):
+        """DAW lane: the waveform of tracks[track], if that lane has audio"""
+        tracks = params['tracks']
+        if track >= len(tracks) or tracks[track] is None:
+            return False
+        self.add_waveform(dwg, tracks[track], x, center, width, view=params.get('view'))
+        return True
+
+    def slot_chart(self, dwg, params, metric, x, y, width, height):
+        """Analytics card: a polyline of series[metric], if there is one"""
+        series = params['series']
+        d = chart_path(series[metric], x, y, width, height) if metric in series else None
+        if d is None:
+            return False
+        dwg.add(dwg.path(
+            d=d,
+            stroke=self.colors['primary'],
+            fill='none',
+            stroke_width=2
         ))
-        
-        # Stats grid
-        stats = [
-            {'label': 'Followers', 'value': '1.2K'},
-            {'label': 'Messages', 'value': '156'},
-            {'label': 'Events', 'value': '3'}
+        return True
+
+    @instrumented('build')
+    def create_content_management_screen(self, uploads=None, scroll=0):
+        """Create content management screen wireframe
+
+        uploads optionally gives the track titles, any sequence; the list
+        then scrolls by scroll pixels and only visible rows are drawn.
+        """
+        return self.build_screen('content_management', uploads=uploads, scroll=scroll)
+
+    @instrumented('build')
+    def create_release_management_screen(self):
+        """Create release management screen wireframe"""
+        return self.build_screen('release_management')
+
+    @instrumented('build')
+    def create_analytics_dashboard_screen(self, series=None):
+        """Create analytics dashboard screen wireframe
+
+        series optionally maps a metric ('Streams', 'Engagement' or
+        'Growth') to its time series, see chart_path; those charts plot
+        the data instead of the placeholder curve.
+        """
+        return self.build_screen('analytics_dashboard', series=series)
+
+    @instrumented('build')
+    def create_community_hub_screen(self, messages=None, scroll=0):
+        """Create community hub screen wireframe
+
+        messages optionally gives the inbox, any sequence of sender names
+        or (sender, preview) pairs; the list then scrolls by scroll pixels
+        and only visible rows are drawn.
+        """
+        return self.build_screen('community_hub', messages=messages, scroll=scroll)
+
+# Journey sections -> (subheader, screen name, next step caption)
+JOURNEY = {
+    "1. Verification Flow": [
+        ("Welcome Screen", 'welcome', "League Selection"),
+        ("League Selection", 'league_selection', "Document Upload")
+    ],
+    "2. Document Verification": [
+        ("Document Upload", 'document_upload', "Profile Setup"),
+        ("Profile Setup", 'profile_setup', "Studio Dashboard")
+    ],
+    "3. Music Creation": [
+        ("Studio Dashboard", 'studio_dashboard', "DAW Interface"),
+        ("DAW Interface", 'daw', "Beat Library")
+    ],
+    "4. Content Management": [
+        ("Content Upload", 'content_management', "Release Management"),
+        ("Release Management", 'release_management', "Analytics Dashboard")
+    ],
+    "5. Community & Revenue": [
+        ("Analytics Dashboard", 'analytics_dashboard', "Community Hub"),
+        ("Community Hub", 'community_hub', None)
+    ]
+}
+
+
+class JourneyGraph:
+    """The journey as a directed graph of screens, prefetching successors
+
+    Each screen's edges lead first to the screen its journey step names
+    next (the following step when that one isn't built, like the Beat
+    Library) and then to the screens its hotspots link to, back arrows
+    aside. show() renders a screen and renders its successors into the
+    render cache on a small thread pool, so whatever the user opens
+    next is usually a cache hit.
+    """
+    def __init__(self, journey=JOURNEY, workers=2):
+        self.journey = journey
+        self.workers = workers
+        steps = [
+            (section, title, name, next_step)
+            for section, screens in journey.items() for title, name, next_step in screens
         ]
-        
-        for i, stat in enumerate(stats):
-            x = 20 + i*(self.screen_width/3 - 20)
-            dwg.add(dwg.rect(
-                (x, y + 20),
-                ((self.screen_width/3 - 30), 80),
-                rx=8, ry=8,
-                fill=self.colors['surface']
-            ))
-            dwg.add(dwg.text(
-                stat['value'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 60),
-                text_anchor='middle',
-                fill=self.colors['text'],
-                style='font-family: SF Pro Text; font-size: 24px; font-weight: bold'
-            ))
+        by_title = {title: name for _, title, name, _ in steps}
+        self.order = [name for _, _, name, _ in steps]
+        self.start = self.order[0]
+        self.titles = {}
+        self.sections = {}
+        self.next = {}
+        for k, (section, title, name, next_step) in enumerate(steps):
+            self.titles[name] = title
+            self.sections[name] = section
+            if next_step:
+                self.next[name] = by_title.get(next_step) or (steps[k + 1][2] if k + 1 < len(steps) else None)
+        self.prefetched = 0
+        self._edges = None
+        self._pool = None
+        # Render key -> future of the prefetches still running
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def successors(self, name):
+        """Screens one step on from name, the journey's next one first"""
+        if self._edges is None:
+            # Links don't depend on size or palette, any instance will do
+            wireframes = AthleteAppWireframes(backend='string')
+            edges = {}
+            for node in self.order:
+                targets = [self.next[node]] if self.next.get(node) else []
+                if node in wireframes.SPECS:
+                    wireframes.compile_screen(node)
+                    back = wireframes.SPECS[node].get('back')
+                    for _, target in wireframes.hotspots[node]:
+                        if target in self.titles and target not in (node, back) and target not in targets:
+                            targets.append(target)
+                edges[node] = targets
+            self._edges = edges
+        return self._edges.get(name, [])
+
+    def show(self, wireframes, name):
+        """Return a screen's SVG and start prefetching its successors"""
+        svg = wireframes.render(name)
+        self.prefetch(wireframes, self.successors(name))
+        return svg
+
+    def prefetch(self, wireframes, names):
+        """Render screens into the render cache in the background
+
+        Screens already cached or being prefetched are skipped.
+        """
+        for name in names:
+            key = wireframes.render_key(name)
+            with self._lock:
+                if key in render_cache or key in self._pending:
+                    continue
+                if self._pool is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='svglofi-prefetch')
+                future = self._pending[key] = self._pool.submit(wireframes.render, name)
+            future.add_done_callback(functools.partial(self._done, key))
+
+    def _done(self, key, future):
+        # A failed prefetch is dropped, rendering the screen for real raises again
+        with self._lock:
+            self._pending.pop(key, None)
+            self.prefetched += future.exception() is None
+
+    def wait(self):
+        """Block until the running prefetches are done"""
+        from concurrent.futures import wait
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def stats(self):
+        with self._lock:
+            return {'prefetched': self.prefetched, 'pending': len(self._pending)}
+
+    def overview(self, wireframes):
+        """Flow diagram of the graph: a column per section, an arrow per edge"""
+        style, heading = TEXT_STYLES['footnote'], TEXT_STYLES['caption']
+        node_width = round(max(
+            *(text_width(title, style) for title in self.titles.values()),
+            *(text_width(section, heading) for section in self.journey)
+        )) + 24
+        node_height, pitch, gap, top = 36, 60, 40, 48
+        place = {}
+        for c, screens in enumerate(self.journey.values()):
+            for r, (_, name, _) in enumerate(screens):
+                place[name] = (20 + c*(node_width + gap), top + r*pitch)
+        rows = max(len(screens) for screens in self.journey.values())
+        width = 40 + len(self.journey)*(node_width + gap) - gap
+        height = top + (rows - 1)*pitch + node_height + 20
+        colors = wireframes.colors
+
+        dwg = wireframes.new_drawing((width, height))
+        dwg.add(dwg.rect((0, 0), (width, height), fill=colors['background']))
+        for c, section in enumerate(self.journey):
+            dwg.add(dwg.text(section, insert=(20 + c*(node_width + gap), 28), fill=colors['secondary'], style=heading))
+        for name in self.order:
+            x0, y0 = place[name]
+            for target in self.successors(name):
+                x1, y1 = place[target]
+                if x0 == x1:
+                    # Same section: straight down (or up) from box to box
+                    sign = 1 if y1 > y0 else -1
+                    cx = x0 + node_width/2
+                    sy, ey = y0 + node_height*(sign > 0), y1 + node_height*(sign < 0)
+                    d = f'M {cx:g},{sy:g} L {cx:g},{ey:g}'
+                    head = f'M {cx:g},{ey:g} L {cx - 5:g},{ey - 8*sign:g} L {cx + 5:g},{ey - 8*sign:g} Z'
+                else:
+                    sx, sy = x0 + node_width, y0 + node_height/2
+                    ex, ey = x1, y1 + node_height/2
+                    mid = (sx + ex) / 2
+                    d = f'M {sx:g},{sy:g} C {mid:g},{sy:g} {mid:g},{ey:g} {ex:g},{ey:g}'
+                    head = f'M {ex:g},{ey:g} L {ex - 8:g},{ey - 5:g} L {ex - 8:g},{ey + 5:g} Z'
+                dwg.add(dwg.path(d=d, stroke=colors['primary'], fill='none', stroke_width=1.5))
+                dwg.add(dwg.path(d=head, fill=colors['primary']))
+        for name, (x, y) in place.items():
+            dwg.add(dwg.rect((x, y), (node_width, node_height), rx=8, ry=8, fill=colors['surface'], stroke=colors['border']))
             dwg.add(dwg.text(
-                stat['label'],
-                insert=(x + (self.screen_width/3 - 30)/2, y + 80),
+                self.titles[name],
+                insert=(x + node_width/2, y + node_height/2 + 4.5),
                 text_anchor='middle',
-                fill=self.colors['secondary'],
-                style='font-family: SF Pro Text; font-size: 13px'
+                fill=colors['text'],
+                style=style
             ))
-        
-        # Compose button
-        dwg.add(dwg.rect(
-            (20, self.screen_height - 80),
-            (self.screen_width - 40, 50),
-            rx=25, ry=25,
-            fill=self.colors['primary']
-        ))
-        dwg.add(dwg.text(
-            "Compose Message",
-            insert=(self.screen_width/2, self.screen_height - 45),
-            text_anchor='middle',
-            fill='white',
-            style='font-family: SF Pro Text; font-size: 17px; font-weight: 600'
-        ))
-        
-        # self.screens['Community Hub'] = dwg
         return dwg
 
+    def overview_svg(self, wireframes):
+        """overview() serialized, kept in the render cache"""
+        key = wireframes.cache_key('__overview__') + (
+            tuple((section, tuple(screens)) for section, screens in self.journey.items()),
+        )
+        return render_cache.get_or_render(key, lambda: self.overview(wireframes).tostring())
+
+
+journey_graph = JourneyGraph()
+
+
+def as_fragment(func):
+    """Make func rerun on its own when its widgets change
+
+    st.fragment (Streamlit >= 1.37, st.experimental_fragment from 1.33)
+    reruns just the decorated function. Older versions, including the
+    pinned 1.28, get func back unchanged and rerun the whole script.
+    """
+    fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return fragment(func) if fragment else func
+
+
+def screen_html(svg, height, zoom=1.0, css_class=None):
+    """Wrap a screen's SVG for display, scaled by zoom"""
+    scope = f' class="{css_class}"' if css_class else ''
+    return (
+        f'<div{scope} style="height:{height * zoom:g}px">'
+        f'<div style="transform:scale({zoom:g});transform-origin:0 0">{svg}</div>'
+        '</div>'
+    )
+
+
+def render_section(wireframes, section):
+    """Show a journey section's screens side by side with its own controls"""
+    screens = JOURNEY[section]
+    index = list(JOURNEY).index(section)
+    zoom_col, theme_col = st.columns(2)
+    zoom = zoom_col.slider("Zoom", 50, 150, 100, step=10, format="%d%%", key=f"zoom-{index}")
+    theme = theme_col.selectbox("Section theme", ["Page theme", *THEMES], key=f"theme-{index}")
+    css_class = None
+    if theme != "Page theme" and wireframes.css_vars:
+        css_class = f'lofi-section-{index}'
+        st.markdown(wireframes.theme_css(theme, f'.{css_class}'), unsafe_allow_html=True)
+
+    for col, (title, name, next_step) in zip(st.columns(len(screens)), screens):
+        with col:
+            st.subheader(title)
+            svg = wireframes.render(name)
+            st.markdown(
+                screen_html(svg, wireframes.screen_height, zoom / 100, css_class),
+                unsafe_allow_html=True
+            )
+            if next_step:
+                st.markdown(f"**Next:** {next_step}")
+
+
+def render_steps(wireframes, graph):
+    """One screen at a time, with buttons to the graph's successors
+
+    Showing a screen prefetches its successors, so the Next buttons
+    find their screens already in the render cache.
+    """
+    state = st.session_state
+    name = state.setdefault('journey_screen', graph.start)
+    history = state.setdefault('journey_history', [])
+
+    def go(target=None):
+        if target is None:
+            state['journey_screen'] = history.pop() if history else graph.start
+        else:
+            history.append(state['journey_screen'])
+            state['journey_screen'] = target
+
+    st.subheader(f"{graph.sections[name]}: {graph.titles[name]}")
+    st.markdown(screen_html(graph.show(wireframes, name), wireframes.screen_height), unsafe_allow_html=True)
+    successors = graph.successors(name)
+    columns = st.columns(1 + max(1, len(successors)))
+    columns[0].button("Back", on_click=go, disabled=not history)
+    for col, target in zip(columns[1:], successors):
+        col.button(f"Next: {graph.titles[target]}", on_click=go, args=(target,), key=f"next-{target}")
+
+
+JOURNEY_PAGE_CSS = (
+    'body{margin:0;background:#1E1E1E;color:#FFFFFF;font-family:sans-serif}'
+    'section{display:grid;grid-template-columns:repeat(auto-fill,minmax(%dpx,1fr));gap:24px;margin-bottom:32px}'
+    'h2{grid-column:1/-1;margin:0}h3{margin:0 0 8px}p{margin:8px 0 0}'
+)
+
+
+def journey_document(wireframes, journey=JOURNEY, theme=None):
+    """Whole journey grid as one self-contained HTML document
+
+    Symbols, classes and theme variables appear once for all screens,
+    so the page goes out as a single component instead of a markdown
+    element per screen. Assembled documents are kept in the render cache.
+    """
+    theme = wireframes.theme if theme is None else THEMES.get(theme, theme)
+
+    def build():
+        parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><style>']
+        parts.append(JOURNEY_PAGE_CSS % wireframes.screen_width)
+        if wireframes.css_vars:
+            parts.append(wireframes.theme_rules(theme))
+        if wireframes.css_classes:
+            parts.append(wireframes.stylesheet().css())
+        parts.append('</style></head><body>')
+        if wireframes.symbols:
+            parts.append(wireframes.symbol_defs())
+        for section, screens in journey.items():
+            parts.append(f'<section><h2>{html.escape(section)}</h2>')
+            for title, name, next_step in screens:
+                parts.append(f'<figure><h3>{html.escape(title)}</h3>{wireframes.render(name)}')
+                if next_step:
+                    parts.append(f'<p><b>Next:</b> {html.escape(next_step)}</p>')
+                parts.append('</figure>')
+            parts.append('</section>')
+        parts.append('</body></html>')
+        return ''.join(parts)
+
+    key = wireframes.cache_key('__journey__') + (
+        tuple((section, tuple(screens)) for section, screens in journey.items()),
+        tuple(sorted(theme.items())) if wireframes.css_vars else None
+    )
+    return render_cache.get_or_render(key, build)
+
+
+def journey_height(wireframes, journey=JOURNEY):
+    """Pixel height of journey_document() with two screens per row"""
+    rows = sum((len(screens) + 1) // 2 for screens in journey.values())
+    return len(journey) * 72 + rows * (wireframes.screen_height + 110)
+
+
+PROTOTYPE_PAGE_CSS = (
+    'body{margin:0;background:#1E1E1E}.screen{display:none}.screen.active{display:block}'
+    '.note{display:none;position:fixed;left:50%;bottom:16px;transform:translateX(-50%);padding:6px 12px;'
+    'border-radius:6px;background:#333;color:#FFF;font:13px sans-serif}.note.active{display:block}'
+)
+
+# Shows one screen at a time and follows hotspots with the grid lookup of
+# HotspotGrid.lookup(), so navigating stays in the browser. Links to
+# screens the journey doesn't have yet only show a note.
+PROTOTYPE_SCRIPT = """
+const grids = %s, start = %s, size = [%s, %s];
+const note = document.body.appendChild(document.createElement('div'));
+note.className = 'note';
+function show(name) {
+  const next = document.getElementById('screen-' + name);
+  if (!next) {
+    note.textContent = name.replace(/_/g, ' ') + ' is not designed yet';
+    note.classList.add('active');
+    clearTimeout(note.timer);
+    note.timer = setTimeout(() => note.classList.remove('active'), 1500);
+    return;
+  }
+  document.querySelectorAll('.screen.active').forEach(el => el.classList.remove('active'));
+  next.classList.add('active');
+}
+function target(event) {
+  const el = event.target.closest('.screen');
+  if (!el) return null;
+  const grid = grids[el.dataset.screen], box = el.firstElementChild.getBoundingClientRect();
+  const x = (event.clientX - box.left) * size[0] / box.width, y = (event.clientY - box.top) * size[1] / box.height;
+  const col = Math.floor(x / grid.cell), row = Math.floor(y / grid.cell);
+  if (col < 0 || col >= grid.columns || row < 0 || row * grid.columns >= grid.cells.length) return null;
+  const cell = grid.cells[row * grid.columns + col];
+  for (let k = cell.length - 1; k >= 0; k--) {
+    const [left, top, w, h, name] = grid.hotspots[cell[k]];
+    if (x >= left && x < left + w && y >= top && y < top + h) return name;
+  }
+  return null;
+}
+document.addEventListener('click', event => { const name = target(event); if (name) show(name); });
+document.addEventListener('mousemove', event => { document.body.style.cursor = target(event) ? 'pointer' : ''; });
+show(start);
+"""
+
+
+def prototype_document(wireframes, start='welcome', theme=None):
+    """Clickable prototype: every screen in one document, linked by hotspots
+
+    All screens come from the render cache, each with the HotspotGrid
+    of its links as JSON. A click is looked up in the grid of the
+    screen showing and swaps which one is visible in the browser, so
+    moving between screens never reruns the page. Assembled documents
+    are kept in the render cache.
+    """
+    theme = wireframes.theme if theme is None else THEMES.get(theme, theme)
+
+    def build():
+        parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><style>', PROTOTYPE_PAGE_CSS]
+        if wireframes.css_vars:
+            parts.append(wireframes.theme_rules(theme))
+        if wireframes.css_classes:
+            parts.append(wireframes.stylesheet().css())
+        parts.append('</style></head><body>')
+        if wireframes.symbols:
+            parts.append(wireframes.symbol_defs())
+        grids = {}
+        for name in wireframes.SPECS:
+            grids[name] = wireframes.hotspot_grid(name).as_dict()
+            parts.append(f'<div class="screen" id="screen-{name}" data-screen="{name}">{wireframes.render(name)}</div>')
+        parts.append('<script>')
+        parts.append(PROTOTYPE_SCRIPT % (
+            json.dumps(grids, separators=(',', ':')), json.dumps(start),
+            wireframes.screen_width, wireframes.screen_height
+        ))
+        parts.append('</script></body></html>')
+        return ''.join(parts)
+
+    key = wireframes.cache_key('__prototype__') + (
+        start,
+        tuple(sorted(theme.items())) if wireframes.css_vars else None
+    )
+    return render_cache.get_or_render(key, build)
+
+
+def shared_state():
+    """The render cache, stats and journey graph every rerun and session use
+
+    Streamlit re-executes this file on each rerun, which recreates the
+    module-level objects (and the graph's prefetch pool); main() swaps
+    in the ones kept by st.cache_resource. SVGLOFI_CACHE_DIR adds the on-disk cache so a
+    fresh process starts warm.
+    """
+    cache_dir = os.environ.get('SVGLOFI_CACHE_DIR')
+    if cache_dir:
+        render_cache.disk = DiskCache(cache_dir)
+    return render_cache, render_stats, journey_graph
+
+
+def debug_enabled():
+    """Diagnostics are shown with SVGLOFI_DEBUG=1 or ?debug=1 in the URL"""
+    if os.environ.get('SVGLOFI_DEBUG') == '1':
+        return True
+    if hasattr(st, 'query_params'):
+        return st.query_params.get('debug') == '1'
+    return st.experimental_get_query_params().get('debug') == ['1']
+
+
+def render_diagnostics():
+    """Sidebar panel with render cache hit rate and per-screen timings"""
+    with st.sidebar.expander("Diagnostics", expanded=True):
+        cache = render_cache.stats()
+        st.metric("Cache hit rate", f"{cache['hit_rate']:.0%}")
+        st.caption(f"{cache['hits']} hits, {cache['misses']} misses, {cache['size']}/{cache['maxsize']} entries")
+        prefetch = journey_graph.stats()
+        st.caption(f"Prefetch: {prefetch['prefetched']} screens rendered ahead, {prefetch['pending']} running")
+        if render_cache.disk is not None:
+            disk = render_cache.disk.stats()
+            st.caption(f"Disk: {disk['hits']} hits, {disk['misses']} misses, {disk['size']}/{disk['max_entries']} files")
+        rows = render_stats.rows()
+        if rows:
+            st.dataframe(rows, hide_index=True)
+            st.caption("base_ms and nav_ms time compiling a screen's plan, once per configuration; builds replay it")
+        else:
+            st.caption("No screens built by this process yet")
+        for screen, overflows in render_stats.overflows().items():
+            for overflow in overflows:
+                st.warning(
+                    f"{screen}: \"{overflow['text']}\" is {overflow['width']}px wide, "
+                    f"{overflow['room']}px fit"
+                )
+
+
 # Update main() to show new screens
 def main():
+    load_streamlit()
     st.set_page_config(layout="wide", page_title="Athlete Journey Wireframes")
+    global render_cache, render_stats, journey_graph
+    render_cache, render_stats, journey_graph = st.cache_resource(shared_state, show_spinner=False)()
     
     st.markdown("""
         <style>
@@ -771,103 +2858,718 @@ def main():
         </style>
     """, unsafe_allow_html=True)
     
-    wireframes = AthleteAppWireframes()
+    wireframes = AthleteAppWireframes(backend='string', symbols=True, css_vars=True)
+    theme = st.sidebar.radio("Theme", list(THEMES))
+    # Only this block changes with the theme, the screens stay cached
+    st.markdown(wireframes.theme_css(theme), unsafe_allow_html=True)
+    # Shared symbols and classes, defined once and used by every screen below
+    st.markdown(wireframes.page_styles(), unsafe_allow_html=True)
+    st.markdown(wireframes.symbol_defs(), unsafe_allow_html=True)
     
     st.title("Athlete Journey Wireframes")
     
-    # 1. Verification Flow
-    st.header("1. Verification Flow")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("Welcome Screen")
-        welcome = wireframes.create_verification_welcome()
-        st.markdown(welcome.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** League Selection")
-    
-    with col2:
-        st.subheader("League Selection")
-        league = wireframes.create_league_selection()
-        st.markdown(league.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Document Upload")
-    
-    # 2. Document Verification
-    st.header("2. Document Verification")
-    col3, col4 = st.columns(2)
-    with col3:
-        st.subheader("Document Upload")
-        doc_upload = wireframes.create_document_upload_screen()
-        st.markdown(doc_upload.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Profile Setup")
-    
-    with col4:
-        st.subheader("Profile Setup")
-        profile = wireframes.create_profile_setup()
-        st.markdown(profile.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Studio Dashboard")
-    
-    # 3. Music Creation
-    st.header("3. Music Creation")
-    col5, col6 = st.columns(2)
-    with col5:
-        st.subheader("Studio Dashboard")
-        studio = wireframes.create_studio_dashboard_screen()
-        st.markdown(studio.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** DAW Interface")
-    
-    with col6:
-        st.subheader("DAW Interface")
-        daw = wireframes.create_daw_screen()
-        st.markdown(daw.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Beat Library")
-    
-    # 4. Content Management
-    st.header("4. Content Management")
-    col7, col8 = st.columns(2)
-    with col7:
-        st.subheader("Content Upload")
-        content = wireframes.create_content_management_screen()
-        st.markdown(content.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Release Management")
-    
-    with col8:
-        st.subheader("Release Management")
-        release = wireframes.create_release_management_screen()
-        st.markdown(release.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Analytics Dashboard")
-    
-    # 5. Community & Revenue
-    st.header("5. Community & Revenue")
-    col9, col10 = st.columns(2)
-    with col9:
-        st.subheader("Analytics Dashboard")
-        analytics = wireframes.create_analytics_dashboard_screen()
-        st.markdown(analytics.tostring(), unsafe_allow_html=True)
-        st.markdown("**Next:** Community Hub")
-    
-    with col10:
-        st.subheader("Community Hub")
-        community = wireframes.create_community_hub_screen()
-        st.markdown(community.tostring(), unsafe_allow_html=True)
+    view = st.sidebar.radio("View", ["Sections", "Step through", "Whole journey", "Clickable prototype"])
+    if view == "Clickable prototype":
+        # Buttons, tabs and rows switch screens in the browser, no reruns
+        components.html(
+            prototype_document(wireframes, theme=theme),
+            height=wireframes.screen_height + 20
+        )
+    elif view == "Step through":
+        render_steps(wireframes, journey_graph)
+    elif view == "Whole journey":
+        # One component instead of a markdown element per screen
+        components.html(
+            journey_document(wireframes, theme=theme),
+            height=journey_height(wireframes),
+            scrolling=True
+        )
+    else:
+        # Sections render one at a time, so only the open one is built
+        # (st.tabs and st.expander would run every section's code on each rerun)
+        section = st.radio("Section", list(JOURNEY), horizontal=True)
+        st.header(section)
+        as_fragment(render_section)(wireframes, section)
+
+    # Journey flow, drawn from the same graph the viewer and prefetch use
+    st.markdown("### Journey Flow")
+    st.markdown(journey_graph.overview_svg(wireframes), unsafe_allow_html=True)
+
+    if debug_enabled():
+        render_diagnostics()
+
+# Device profiles for exports: name -> (width, height)
+DEVICES = {
+    'small': (320, 568),
+    'phone': (360, 640),
+    'large': (414, 896),
+    'tablet': (768, 1024)
+}
+
+EXPORT_MANIFEST = '.svglofi-manifest.json'
+
+
+class DeviceBatch(AthleteAppWireframes):
+    """Wireframes for several screen sizes at once
+
+    The screen size is a pair of DeviceValues, so compiling a spec works
+    out its geometry for every size in one vectorized pass. Serializing
+    once gives markup with placeholder tokens, and each size's SVG is a
+    single str.format() of that template. Only the string backend.
+    """
+    def __init__(self, sizes, **options):
+        import numpy as np
+
+        self.sizes = list(sizes)
+        self.registry = []
+        widths, heights = zip(*self.sizes)
+        super().__init__(
+            backend='string',
+            screen_width=DeviceValues(np.array(widths), self.registry),
+            screen_height=DeviceValues(np.array(heights), self.registry),
+            **options
+        )
+
+    # Fitting differs per size, single-size wireframes report it
+    check_overflow = False
+
+    def template(self, name):
+        """Screen markup as a str.format() template, a field per token"""
+        svg = self.build_screen(name).tostring()
+        svg = svg.replace('{', '{{').replace('}', '}}')
+        return re.sub('\x00(\\d+)\x00', r'{\1}', svg)
+
+    def render_all(self, names):
+        """Screen name -> [SVG per size]
+
+        Screens whose layout diverges between sizes (text wrapping
+        differently, say) are built for each size on its own.
+        """
+        templates = {}
+        for name in names:
+            try:
+                templates[name] = self.template(name)
+            except LayoutDiverges:
+                templates[name] = None
+        # Every token's value for each size, as Python numbers
+        values = list(zip(*(device.values.tolist() for device in self.registry)))
+        values = values or [()] * len(self.sizes)
+        options = {
+            'theme': self.theme, 'symbols': self.symbols,
+            'css_classes': self.css_classes, 'css_vars': self.css_vars
+        }
+        rendered = {}
+        for name, template in templates.items():
+            if template is None:
+                rendered[name] = [
+                    AthleteAppWireframes(
+                        backend='string', screen_width=width, screen_height=height, **options
+                    ).build_screen(name).tostring()
+                    for width, height in self.sizes
+                ]
+            else:
+                rendered[name] = [template.format(*row) for row in values]
+        return rendered
+
+
+def render_variants(screens=None, devices=None, **options):
+    """Render screens for many device sizes together
+
+    devices maps names to (width, height) or lists names from DEVICES
+    (default: all of them); options go to AthleteAppWireframes. Returns
+    {device: {screen: svg}}, the markup render() gives for each size.
+    """
+    screens = screens or list(AthleteAppWireframes.SPECS)
+    devices = devices or DEVICES
+    if not isinstance(devices, dict):
+        devices = {device: DEVICES[device] for device in devices}
+    rendered = DeviceBatch(devices.values(), **options).render_all(screens)
+    return {
+        device: {screen: rendered[screen][k] for screen in screens}
+        for k, device in enumerate(devices)
+    }
+
+
+# Geometry attributes whose numbers minify_svg() rounds
+MINIFY_NUMERIC = frozenset({
+    'x', 'y', 'width', 'height', 'cx', 'cy', 'r', 'rx', 'ry',
+    'x1', 'y1', 'x2', 'y2', 'd', 'points', 'viewBox', 'stroke-width'
+})
+
+# Attributes left out at their initial value, per element
+MINIFY_DEFAULTS = {
+    'rect': {'x': '0', 'y': '0'},
+    'text': {'x': '0', 'y': '0'},
+    'use': {'x': '0', 'y': '0'},
+    'circle': {'cx': '0', 'cy': '0'},
+    'ellipse': {'cx': '0', 'cy': '0'},
+    'line': {'x1': '0', 'y1': '0', 'x2': '0', 'y2': '0'}
+}
+
+# Inherited properties at their initial value, left out where nothing
+# above the element could have set them
+MINIFY_INHERITED = {
+    'stroke': 'none',
+    'stroke-width': '1',
+    'stroke-opacity': '1',
+    'fill-opacity': '1',
+    'stroke-dasharray': 'none',
+    'text-anchor': 'start'
+}
+
+# Inherited presentation attributes a run of siblings can share from a <g>
+MINIFY_GROUPABLE = (
+    'fill', 'stroke', 'stroke-width', 'stroke-dasharray', 'stroke-linecap', 'stroke-linejoin',
+    'text-anchor', 'font-family', 'font-size', 'font-weight', 'style'
+)
+
+# CSS properties that inherit, so a style made of them can move to a <g>
+INHERITED_CSS = frozenset({
+    'fill', 'stroke', 'stroke-width', 'stroke-dasharray', 'stroke-linecap', 'stroke-linejoin',
+    'text-anchor', 'font-family', 'font-size', 'font-weight', 'font-style', 'color'
+})
+
+MINIFY_SHAPES = frozenset({'rect', 'circle', 'ellipse', 'line', 'path', 'polyline', 'polygon', 'text', 'use'})
+
+SVG_TOKEN = re.compile(
+    r'<!\[CDATA\[.*?\]\]>|<!--.*?-->|<\?.*?\?>'
+    r'|<(/?)([\w:.-]+)((?:\s+[\w:.-]+="[^"]*")*)\s*(/?)>'
+    r'|[^<]+',
+    re.S
+)
+SVG_ATTRIBUTE = re.compile(r'([\w:.-]+)="([^"]*)"')
+SVG_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+SVG_HEX_COLOR = re.compile(r'#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3')
+
+
+class SvgElement:
+    """An element of markup parsed by parse_svg()
+
+    children holds SvgElements and raw strings (text, CDATA).
+    """
+    __slots__ = ('tag', 'attrs', 'children')
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+    def tostring(self, inner=None):
+        """Markup of the element, with inner (default: the children's) inside"""
+        attrs = ''.join(f' {name}="{value}"' for name, value in self.attrs.items())
+        if inner is None:
+            inner = ''.join(child if isinstance(child, str) else child.tostring() for child in self.children)
+        if not inner:
+            return f'<{self.tag}{attrs}/>'
+        return f'<{self.tag}{attrs}>{inner}</{self.tag}>'
+
+
+def parse_svg(markup):
+    """Parse serialized markup, as the backends write it, into SvgElements"""
+    root = SvgElement(None, {})
+    stack = [root]
+    for match in SVG_TOKEN.finditer(markup):
+        closing, tag, attrs, empty = match.groups()
+        if tag is None:
+            stack[-1].children.append(match.group())
+        elif closing:
+            stack.pop()
+        else:
+            element = SvgElement(tag, dict(SVG_ATTRIBUTE.findall(attrs)))
+            stack[-1].children.append(element)
+            if not empty:
+                stack.append(element)
+    return root.children[-1]
+
+
+def short_number(match, precision):
+    """A number rounded to precision decimals, written as short as it goes"""
+    text = f'{float(match.group()):.{precision}f}'
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text == '-0':
+        return '0'
+    if text.startswith(('0.', '-0.')):
+        text = text.replace('0.', '.', 1)
+    return text
+
+
+def minify_svg(markup, precision=1, merge=True):
+    """Smaller markup drawing the same screen
+
+    Numbers in geometry attributes are rounded to precision decimals and
+    written short, path data loses its optional spaces, #RRGGBB colors
+    become #RGB where they can, and attributes at their initial value
+    go (inherited ones only where nothing above sets them). With merge,
+    adjacent stroked paths with the same attributes become one path, and
+    runs of siblings sharing inherited attributes move them to a <g>.
+    """
+    if not isinstance(precision, int) or precision < 0:
+        raise ValueError(f"Precision must be a whole number of decimals >= 0, got {precision!r}")
+    root = parse_svg(markup)
+    _minify_element(root, precision, merge, clean=True)
+    body = ''.join(child if isinstance(child, str) else child.tostring() for child in root.children)
+    for attr in ('baseProfile', 'version'):
+        root.attrs.pop(attr, None)
+    # Namespaces nothing uses any more
+    for prefix in ('ev', 'xlink'):
+        if f' {prefix}:' not in body:
+            root.attrs.pop(f'xmlns:{prefix}', None)
+    return root.tostring(body)
+
+
+def _minify_element(element, precision, merge, clean):
+    """Minify element's attributes and, recursively, its children
+
+    clean says no ancestor can set inherited properties (no presentation
+    attributes, classes or styles above, and not inside a symbol).
+    """
+    attrs = element.attrs
+    for name, value in attrs.items():
+        if name in MINIFY_NUMERIC:
+            value = SVG_NUMBER.sub(lambda match: short_number(match, precision), value)
+            if name == 'd':
+                value = re.sub(r'\s*([A-Za-z])\s*', r'\1', value)
+                value = re.sub(r'\s*,\s*', ',', value)
+                value = re.sub(r'\s+(?=-)|,(?=-)', '', value)
+        if name in ('fill', 'stroke'):
+            value = SVG_HEX_COLOR.sub(r'#\1\2\3', value)
+        if name == 'style':
+            value = ';'.join(
+                ':'.join(part.strip() for part in declaration.split(':', 1))
+                for declaration in value.split(';') if declaration.strip()
+            )
+        attrs[name] = value
+    if element.tag == 'rect':
+        if attrs.get('ry') is not None and attrs.get('ry') == attrs.get('rx'):
+            del attrs['ry']
+        if attrs.get('rx') == '0' and 'ry' not in attrs:
+            del attrs['rx']
+    for name, default in MINIFY_DEFAULTS.get(element.tag, {}).items():
+        if attrs.get(name) == default:
+            del attrs[name]
+    if clean:
+        for name, default in MINIFY_INHERITED.items():
+            if attrs.get(name) == default:
+                del attrs[name]
+
+    inner_clean = clean and element.tag != 'symbol' and not any(
+        name in attrs for name in ('class', 'style', *MINIFY_GROUPABLE)
+    )
+    children = []
+    for child in element.children:
+        if isinstance(child, SvgElement):
+            _minify_element(child, precision, merge, inner_clean)
+            if child.tag == 'defs' and not child.children:
+                continue
+        children.append(child)
+    # A clipPath may only hold shapes, so its children are never grouped
+    element.children = _merge_siblings(children, groups=element.tag != 'clipPath') if merge else children
+
+
+def _merge_siblings(children, groups=True):
+    """Join adjacent stroked paths and, with groups, group runs sharing inherited attributes"""
+    joined = []
+    for child in children:
+        last = joined[-1] if joined else None
+        if (isinstance(child, SvgElement) and isinstance(last, SvgElement)
+                and child.tag == last.tag == 'path' and not child.children and not last.children
+                and child.attrs.get('fill') == 'none' and 'id' not in child.attrs
+                and {**child.attrs, 'd': None} == {**last.attrs, 'd': None}
+                and child.attrs.get('d', '').startswith('M') and last.attrs.get('d', '').startswith('M')):
+            # Subpaths stroke and dash exactly like separate paths
+            last.attrs['d'] += child.attrs['d']
+            continue
+        joined.append(child)
+    if not groups:
+        return joined
+
+    def shared(child):
+        if not isinstance(child, SvgElement) or child.tag not in MINIFY_SHAPES:
+            return set()
+        return {
+            (name, child.attrs[name]) for name in MINIFY_GROUPABLE if name in child.attrs
+            and (name != 'style' or all(
+                declaration.split(':')[0] in INHERITED_CSS for declaration in child.attrs[name].split(';')
+            ))
+        }
+
+    merged = []
+    k = 0
+    while k < len(joined):
+        # The run from k sharing the attributes worth most once moved to a
+        # <g>: n elements save n - 1 copies, the <g> and </g> cost 7 bytes
+        common = shared(joined[k])
+        best, best_saving, best_common = k + 1, 0, set()
+        end = k + 1
+        while common and end < len(joined):
+            common = common & shared(joined[end])
+            end += 1
+            saving = (end - k - 1) * sum(len(f' {name}="{value}"') for name, value in common) - len('<g></g>')
+            if saving > best_saving:
+                best, best_saving, best_common = end, saving, common
+        run = joined[k:best]
+        if best_common:
+            group = SvgElement('g', {name: value for name, value in sorted(best_common)})
+            for child in run:
+                for name, _ in best_common:
+                    del child.attrs[name]
+            group.children = run
+            merged.append(group)
+        else:
+            merged.extend(run)
+        k = best
+    return merged
+
+
+def write_svgz(path, markup):
+    """Write markup gzip-compressed, as an .svgz file"""
+    import gzip
+
+    write_atomic(path, gzip.compress(markup.encode(), 9, mtime=0))
+
+
+def minify_report(screens=None, precision=1, **options):
+    """Per-screen sizes in bytes: as rendered, minified, and both gzipped
+
+    options configure the AthleteAppWireframes rendered with, standalone.
+    """
+    import gzip
+
+    wireframes = AthleteAppWireframes(backend='string', **options)
+    rows = []
+    for name in screens or wireframes.SPECS:
+        svg = wireframes.render(name, standalone=True)
+        minified = minify_svg(svg, precision)
+        rows.append({
+            'screen': name,
+            'bytes': len(svg.encode()),
+            'minified': len(minified.encode()),
+            'saved': round(1 - len(minified) / len(svg), 3),
+            'gzip': len(gzip.compress(svg.encode(), 9, mtime=0)),
+            'svgz': len(gzip.compress(minified.encode(), 9, mtime=0))
+        })
+    return rows
+
+
+def export_job(screen, devices, theme, precision=None, svgz=False):
+    """Render a screen for several devices for the export CLI (runs in a worker)
+
+    Returns device -> file contents, minified when precision is given.
+    """
+    variants = render_variants([screen], devices, theme=theme)
+    files = {}
+    for device, screens in variants.items():
+        svg = screens[screen]
+        if precision is not None:
+            svg = minify_svg(svg, precision)
+        if svgz:
+            import gzip
+            files[device] = gzip.compress(svg.encode(), 9, mtime=0)
+        else:
+            files[device] = svg.encode()
+    return files
+
+
+def export_screens(out_dir, screens=None, devices=None, themes=None, jobs=None, force=False,
+                   precision=None, svgz=False):
+    """Export screens as <out_dir>/<device>/<theme>/<screen>.svg
+
+    Work is spread over a process pool. Files whose inputs (geometry,
+    palette and the builder code) match the manifest from an earlier
+    run are skipped unless force is set. With precision the files are
+    minified (see minify_svg()), with svgz written gzipped as .svgz.
+    Returns (written, skipped).
+    """
+    screens = screens or list(AthleteAppWireframes.SPECS)
+    devices = devices or list(DEVICES)
+    themes = themes or list(THEMES)
+    manifest_path = os.path.join(out_dir, EXPORT_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    pending = {}
+    skipped = []
+    for device in devices:
+        width, height = DEVICES[device]
+        for theme in themes:
+            wireframes = AthleteAppWireframes(theme=theme, screen_width=width, screen_height=height)
+            for screen in screens:
+                path = os.path.join(device, theme, f"{screen}.{'svgz' if svgz else 'svg'}")
+                fingerprint = wireframes.fingerprint(screen)
+                if precision is not None:
+                    fingerprint += f':minified-{precision}'
+
+                if (not force and manifest.get(path) == fingerprint
+                        and os.path.exists(os.path.join(out_dir, path))):
+                    skipped.append(path)
+                else:
+                    pending[path] = (fingerprint, (screen, device, theme))
+
+    written = []
+    if pending:
+        # A job per screen and theme lays out all its pending devices at once
+        batches = {}
+        for path, (_, (screen, device, theme)) in pending.items():
+            batches.setdefault((screen, theme), {})[device] = path
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                key: pool.submit(export_job, key[0], list(paths), key[1], precision, svgz)
+                for key, paths in batches.items()
+            }
+            for key, future in futures.items():
+                for device, data in future.result().items():
+                    path = batches[key][device]
+                    write_atomic(os.path.join(out_dir, path), data)
+                    manifest[path] = pending[path][0]
+                    written.append(path)
+        write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode())
+    return written, skipped
+
+
+# Screen sizes the server accepts for w and h, in pixels
+SERVE_SIZES = range(100, 4097)
+
+
+@functools.lru_cache(maxsize=64)
+def served_wireframes(width, height, theme):
+    """Wireframes the HTTP server renders a size and theme with"""
+    return AthleteAppWireframes(backend='string', theme=theme, screen_width=width, screen_height=height)
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip
+
+    An explicit gzip entry wins over '*'; either one with q=0 refuses it.
+    """
+    quality = {}
+    for coding in accept_encoding.split(','):
+        name, *params = coding.split(';')
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    pass
+        quality[name.strip().lower()] = q
+    return quality.get('gzip', quality.get('*', 0)) > 0
+
+
+class ScreenService:
+    """Responses for GET /screens/<name>.svg?w=&h=&theme=, minus the server
+
+    A body is rendered once per screen, size and theme, gzipped once and
+    kept in a RenderCache along with its strong ETag, the fingerprint()
+    of the render inputs and builder source. Repeat requests cost a cache
+    lookup; revalidations with a matching If-None-Match get a 304.
+    """
+    def __init__(self, maxsize=512):
+        self.responses = RenderCache(maxsize)
+
+    def entry(self, name, width, height, theme):
+        """(etag, body, gzipped body) of a screen"""
+        import gzip
+
+        def build():
+            wireframes = served_wireframes(width, height, theme)
+            body = wireframes.render(name, standalone=True).encode()
+            return wireframes.fingerprint(name)[:32], body, gzip.compress(body, 9, mtime=0)
+
+        return self.responses.get_or_render((name, width, height, theme), build)
+
+    def respond(self, path, headers):
+        """Return (status, headers, body) for a GET of path"""
+        from urllib.parse import parse_qs, urlsplit
+
+        url = urlsplit(path)
+        match = re.fullmatch(r'/screens/(\w+)\.svg', url.path)
+        if not match or match.group(1) not in AthleteAppWireframes.SPECS:
+            return self.error(404, "No such screen")
+        query = parse_qs(url.query)
+        try:
+            width = int(query.get('w', ['360'])[-1])
+            height = int(query.get('h', ['640'])[-1])
+        except ValueError:
+            return self.error(400, "w and h must be integers")
+        if width not in SERVE_SIZES or height not in SERVE_SIZES:
+            return self.error(400, f"w and h must be {SERVE_SIZES.start} to {SERVE_SIZES.stop - 1}")
+        theme = query.get('theme', ['light'])[-1]
+        if theme not in THEMES:
+            return self.error(400, f"theme must be one of {', '.join(THEMES)}")
+
+        digest, body, compressed = self.entry(match.group(1), width, height, theme)
+        gzipped = accepts_gzip(headers.get('Accept-Encoding', ''))
+        # Each encoding is its own representation with its own strong ETag,
+        # only the one selected for this request can be revalidated
+        reply = {
+            'ETag': f'"{digest}-gz"' if gzipped else f'"{digest}"',
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding'
+        }
+        requested = {tag.strip().removeprefix('W/') for tag in headers.get('If-None-Match', '').split(',')}
+        if '*' in requested or reply['ETag'] in requested:
+            return 304, reply, b''
+        reply['Content-Type'] = 'image/svg+xml'
+        if gzipped:
+            reply['Content-Encoding'] = 'gzip'
+            body = compressed
+        reply['Content-Length'] = str(len(body))
+        return 200, reply, body
+
+    @staticmethod
+    def error(status, message):
+        body = f'{message}\n'.encode()
+        return status, {'Content-Type': 'text/plain; charset=utf-8', 'Content-Length': str(len(body))}, body
+
+
+def make_server(host='127.0.0.1', port=8000, workers=8, quiet=False, service=None):
+    """HTTP server for a ScreenService on a bounded pool of worker threads
+
+    At most workers connections are handled at once. While they're all
+    busy the server stops accepting, so further connections wait in the
+    listen backlog instead of each getting a thread. Idle keep-alive
+    connections are closed after 5 seconds to free their worker.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    service = service or ScreenService()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'svglofi'
+        timeout = 5
+        # Headers and body are separate writes, Nagle would hold the body
+        # back for the client's delayed ACK on keep-alive connections
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.reply(send_body=True)
+
+        def do_HEAD(self):
+            self.reply(send_body=False)
+
+        def reply(self, send_body):
+            status, headers, body = service.respond(self.path, self.headers)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    class Server(HTTPServer):
+        def __init__(self):
+            super().__init__((host, port), Handler)
+            self.service = service
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix='svglofi-http')
+            self.slots = threading.BoundedSemaphore(workers)
+
+        def process_request(self, request, client_address):
+            self.slots.acquire()
+            self.pool.submit(self.work, request, client_address)
+
+        def work(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                self.slots.release()
+
+        def server_close(self):
+            super().server_close()
+            self.pool.shutdown()
+
+    return Server()
+
+
+def _names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def _precision(value):
+    try:
+        precision = int(value)
+    except ValueError:
+        precision = -1
+    if precision < 0:
+        raise argparse.ArgumentTypeError(f"expected a whole number of decimals >= 0, got {value!r}")
+    return precision
+
+
+def cli(argv=None):
+    """Command line entry point: python svglofi.py export|serve ..."""
+    parser = argparse.ArgumentParser(prog='svglofi.py', description="Athlete journey wireframes")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="write screens as standalone .svg files")
+    export.add_argument('--out', default='wireframes', help="output directory (default: wireframes)")
+    export.add_argument('--screens', type=_names, help="comma separated screens (default: all)")
+    export.add_argument('--devices', type=_names,
+                        help=f"comma separated devices from {', '.join(DEVICES)} (default: all)")
+    export.add_argument('--themes', type=_names,
+                        help=f"comma separated themes from {', '.join(THEMES)} (default: all)")
+    export.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+    export.add_argument('--force', action='store_true', help="rewrite files even if unchanged")
+    export.add_argument('--precision', type=_precision,
+                        help="minify, rounding coordinates to this many decimals")
+    export.add_argument('--svgz', action='store_true', help="write gzipped .svgz files")
+    minify = commands.add_parser('minify', help="report per-screen sizes before and after minifying")
+    minify.add_argument('--precision', type=_precision, default=1, help="decimals coordinates keep (default: 1)")
+    minify.add_argument('--screens', type=_names, help="comma separated screens (default: all)")
+    minify.add_argument('--theme', default='light', choices=list(THEMES), help="palette (default: light)")
+    serve = commands.add_parser('serve', help="serve screens at /screens/<name>.svg?w=&h=&theme=")
+    serve.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=8000, help="port to listen on (default: 8000)")
+    serve.add_argument('--workers', type=int, default=8, help="worker threads (default: 8)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = make_server(args.host, args.port, args.workers)
+        print(f"Serving screens on http://{args.host}:{server.server_address[1]}/screens/<name>.svg")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+
+    for option, known in (('screens', AthleteAppWireframes.SPECS), ('devices', DEVICES), ('themes', THEMES)):
+        unknown = sorted(set(getattr(args, option, None) or ()) - set(known))
+        if unknown:
+            parser.error(f"unknown {option}: {', '.join(unknown)}")
+
+    if args.command == 'minify':
+        rows = minify_report(args.screens, args.precision, theme=args.theme)
+        print(f"{'screen':22} {'bytes':>7} {'minified':>9} {'saved':>6} {'gzip':>6} {'svgz':>6}")
+        for row in rows:
+            print(f"{row['screen']:22} {row['bytes']:7} {row['minified']:9} {row['saved']:6.1%} {row['gzip']:6} {row['svgz']:6}")
+        total, minified = sum(row['bytes'] for row in rows), sum(row['minified'] for row in rows)
+        print(f"{'total':22} {total:7} {minified:9} {1 - minified / total:6.1%}")
+        return 0
+
+    written, skipped = export_screens(
+        args.out, args.screens, args.devices, args.themes, args.jobs, args.force,
+        args.precision, args.svgz
+    )
+    print(f"{len(written)} written, {len(skipped)} unchanged in {args.out}")
+    return 0
 
-    # Journey Flow Description
-    st.markdown("""
-    ### Journey Flow Description
-    1. **Verification Flow**
-        - Welcome → League Selection → Document Upload
-        - Verify athlete status and create profile
-    
-    2. **Music Creation**
-        - Studio Dashboard → DAW Interface → Beat Library
-        - Create and record music
-    
-    3. **Content Management**
-        - Content Upload → Release Management
-        - Manage and distribute content
-    
-    4. **Community & Revenue**
-        - Analytics Dashboard → Community Hub
-        - Track performance and engage with fans
-    """)
 
 if __name__ == "__main__":
+    # `streamlit run svglofi.py` passes no command and gets the app
+    if len(sys.argv) > 1 and sys.argv[1] in ('export', 'serve', 'minify'):
+        sys.exit(cli())
     main()
@@ -0,0 +1,186 @@
+"""Reading audio for the DAW lanes: WAV headers, raw PCM and peak pyramids"""
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import svglofi
+
+FRAMES = 1000
+
+
+def wav_bytes(tag, bits, channels, data, size=None, extensible=False, extra_chunk=True):
+    """A WAV file around data; size overrides the data chunk's size field"""
+    rate = 8000
+    block = channels * bits // 8
+    fmt = struct.pack('<HHIIHH', 0xFFFE if extensible else tag, channels, rate, rate * block, block, bits)
+    if extensible:
+        guid_tail = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+        fmt += struct.pack('<HHI', 22, bits, 0) + struct.pack('<H', tag) + guid_tail
+    chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    if extra_chunk:
+        # An odd-sized chunk before the data, padded to even length
+        chunks += b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+    chunks += b'data' + struct.pack('<I', len(data) if size is None else size) + data
+    return b'RIFF' + struct.pack('<I', 4 + len(chunks)) + b'WAVE' + chunks
+
+
+def ramp(channels=2):
+    """-1..1 ramp per channel, the second channel at half level"""
+    values = np.linspace(-1, 1, FRAMES)
+    return np.column_stack([values / (k + 1) for k in range(channels)])
+
+
+def encode(values, bits, tag=1):
+    if tag == 3:
+        return values.astype(f'<f{bits // 8}').tobytes()
+    if bits == 8:
+        return np.round(values * 127 + 128).astype('u1').tobytes()
+    ints = np.round(values * (2 ** (bits - 1) - 1)).astype('<i4')
+    if bits == 24:
+        return ints.view('u1').reshape(*ints.shape, 4)[..., :3].tobytes()
+    return ints.astype(f'<i{bits // 8}').tobytes()
+
+
+@pytest.mark.parametrize('tag, bits', [(1, 8), (1, 16), (1, 24), (1, 32), (3, 32), (3, 64)])
+@pytest.mark.parametrize('extensible', [False, True])
+def test_wav_encodings(tmp_path, tag, bits, extensible):
+    values = ramp()
+    path = tmp_path / 'take.wav'
+    path.write_bytes(wav_bytes(tag, bits, 2, encode(values, bits, tag), extensible=extensible))
+    samples = svglofi.open_samples(path)
+    assert len(samples) == FRAMES and samples.shape[1] == 2
+    mins, maxs = svglofi.minmax_decimate(samples, 4)
+    assert mins[0] == pytest.approx(-1, abs=0.02) and maxs[-1] == pytest.approx(1, abs=0.02)
+    # Every column holds both channels
+    assert maxs[0] == pytest.approx(mins[0] / 2 + 0.25, abs=0.02)
+
+
+@pytest.mark.parametrize('size', [0, 0xFFFFFFFF])
+def test_unknown_data_size_reads_to_end(tmp_path, size):
+    path = tmp_path / 'recording.wav'
+    path.write_bytes(wav_bytes(1, 16, 2, encode(ramp(), 16), size=size))
+    assert len(svglofi.open_samples(path)) == FRAMES
+
+
+def test_data_size_limits_frames(tmp_path):
+    path = tmp_path / 'trailer.wav'
+    data = encode(ramp(), 16)
+    path.write_bytes(wav_bytes(1, 16, 2, data + b'\x00' * 64, size=len(data), extra_chunk=False))
+    assert len(svglofi.open_samples(path)) == FRAMES
+
+
+def test_bad_wavs(tmp_path):
+    path = tmp_path / 'adpcm.wav'
+    path.write_bytes(wav_bytes(2, 4, 1, b'\x00' * 100))
+    with pytest.raises(ValueError, match='unsupported'):
+        svglofi.open_samples(path)
+    path.write_bytes(wav_bytes(1, 16, 1, b'')[:-8])
+    with pytest.raises(ValueError, match='no data chunk'):
+        svglofi.open_samples(path)
+
+
+@pytest.mark.parametrize('dtype, bits, tag', [('<i2', 16, 1), ('<f4', 32, 3), (svglofi.INT24, 24, 1)])
+def test_raw_pcm(tmp_path, dtype, bits, tag):
+    path = tmp_path / 'stem.raw'
+    path.write_bytes(encode(ramp(), bits, tag))
+    samples = svglofi.open_samples(path, dtype, 2)
+    assert len(samples) == FRAMES
+    mins, maxs = svglofi.minmax_decimate(samples, 1)
+    assert (mins[0], maxs[0]) == (pytest.approx(-1, abs=0.01), pytest.approx(1, abs=0.01))
+
+
+def test_empty_sources(tmp_path):
+    path = tmp_path / 'empty.raw'
+    path.write_bytes(b'')
+    assert svglofi.open_samples(path, '<f4', 2).shape == (0, 2)
+    assert svglofi.open_samples([]).shape == (0, 1)
+    wav = tmp_path / 'empty.wav'
+    wav.write_bytes(wav_bytes(1, 16, 2, b''))
+    assert svglofi.open_samples(wav).shape == (0, 2)
+
+
+def test_raw_track_format_reaches_the_lane(tmp_path):
+    path, wav = tmp_path / 'stem.raw', tmp_path / 'stem.wav'
+    data = encode(ramp() * 0.5, 32, 3)
+    path.write_bytes(data)
+    wav.write_bytes(wav_bytes(3, 32, 2, data))
+    wireframes = svglofi.AthleteAppWireframes(backend='string')
+    as_float = wireframes.create_daw_screen(tracks=[(str(path), '<f4', 2)]).tostring()
+    expected = wireframes.create_daw_screen(tracks=[str(wav)]).tostring()
+    assert as_float == expected
+    # Read with the default format the same bytes draw something else
+    assert wireframes.create_daw_screen(tracks=[str(path)]).tostring() != expected
+
+
+def pyramid_levels(path):
+    """Levels of a pyramid scanned from scratch, without a sidecar"""
+    pyramid = svglofi.PeakPyramid(path, '<i2', 2)
+    pyramid.update()
+    return pyramid.levels
+
+
+def test_pyramid_growth_matches_rebuild(tmp_path):
+    values = np.sin(np.linspace(0, 60, 40 * svglofi.PeakPyramid.BASE_BLOCK))
+    data = encode(np.column_stack([values, values / 2]), 16)
+    path = tmp_path / 'growing.raw'
+    # Odd cut points leave partial blocks for the next update to finish
+    for cut in (1000, 5003, 9001, len(data) // 4):
+        path.write_bytes(data[:cut * 4])
+        pyramid = svglofi.PeakPyramid.for_file(path, '<i2', 2)
+    full = tmp_path / 'full.raw'
+    full.write_bytes(data)
+    expected = pyramid_levels(full)
+    assert len(pyramid.levels) == len(expected)
+    for grown, rebuilt in zip(pyramid.levels, expected):
+        np.testing.assert_array_equal(grown, rebuilt)
+    # A fresh pyramid over the grown file trusts its sidecar
+    loaded = svglofi.PeakPyramid(path, '<i2', 2)
+    loaded.update()
+    assert loaded.covered == pyramid.covered
+    for grown, rebuilt in zip(loaded.levels, expected):
+        np.testing.assert_array_equal(grown, rebuilt)
+
+
+@pytest.mark.parametrize('replacement', ['other take', 'shorter'])
+def test_pyramid_rescans_changed_audio(tmp_path, replacement):
+    block = svglofi.PeakPyramid.BASE_BLOCK
+    quiet = np.full((32 * block, 2), 0.1)
+    path = tmp_path / 'take.raw'
+    path.write_bytes(encode(quiet, 16))
+    pyramid = svglofi.PeakPyramid.for_file(path, '<i2', 2)
+    assert pyramid.peaks(4)[1].max() == pytest.approx(0.1, abs=0.001)
+
+    if replacement == 'other take':
+        # Same length and same first and last blocks, loud in between
+        loud = quiet.copy()
+        loud[block:-block] = 0.9
+    else:
+        loud = np.full((8 * block, 2), 0.9)
+    path.write_bytes(encode(loud, 16))
+    os.utime(path, ns=(0, 1))
+    pyramid = svglofi.PeakPyramid.for_file(path, '<i2', 2)
+    assert pyramid.covered == len(loud)
+    assert pyramid.peaks(4)[1].max() == pytest.approx(0.9, abs=0.001)
+    for scanned, rebuilt in zip(pyramid.levels, pyramid_levels(path)):
+        np.testing.assert_array_equal(scanned, rebuilt)
+
+
+def test_pyramid_registry_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(svglofi.PeakPyramid, 'MAX_LOADED', 3)
+    monkeypatch.setattr(svglofi.PeakPyramid, '_loaded', OrderedDict())
+    paths = []
+    for k in range(5):
+        paths.append(tmp_path / f'{k}.raw')
+        paths[-1].write_bytes(b'\x00' * 1024)
+    first = svglofi.PeakPyramid.for_file(paths[0])
+    for path in paths[1:3]:
+        svglofi.PeakPyramid.for_file(path)
+    # Using the first again keeps it over the second
+    assert svglofi.PeakPyramid.for_file(paths[0]) is first
+    for path in paths[3:]:
+        svglofi.PeakPyramid.for_file(path)
+    loaded = [key[0] for key in svglofi.PeakPyramid._loaded]
+    assert loaded == [str(paths[0]), str(paths[3]), str(paths[4])]
@@ -0,0 +1,130 @@
+"""The in-memory render cache and the disk cache behind it"""
+import os
+
+import pytest
+
+import svglofi
+
+
+def counting(value):
+    """A render function returning value that counts its calls"""
+    def render():
+        render.calls += 1
+        return value
+    render.calls = 0
+    return render
+
+
+@pytest.fixture
+def fingerprint(monkeypatch):
+    """Set the module source digest the disk cache files entries under"""
+    def set_digest(digest):
+        monkeypatch.setattr(svglofi, 'source_fingerprint', lambda: digest)
+    set_digest('a' * 64)
+    return set_digest
+
+
+def test_disk_round_trip(tmp_path, fingerprint):
+    disk = svglofi.DiskCache(tmp_path)
+    assert disk.get(('welcome', 1)) is None
+    disk.put(('welcome', 1), '<svg>welcome</svg>')
+    assert disk.get(('welcome', 1)) == '<svg>welcome</svg>'
+    # A new process finds what the last one wrote
+    assert svglofi.DiskCache(tmp_path).get(('welcome', 1)) == '<svg>welcome</svg>'
+    assert disk.stats() == {'size': 1, 'max_entries': 2048, 'hits': 1, 'misses': 1}
+
+
+def test_source_change_invalidates(tmp_path, fingerprint):
+    svglofi.DiskCache(tmp_path).put('welcome', '<svg>old</svg>')
+    fingerprint('b' * 64)
+    disk = svglofi.DiskCache(tmp_path)
+    assert disk.get('welcome') is None
+    assert os.listdir(tmp_path) == [os.path.basename(disk.directory)]
+
+
+def test_eviction_removes_oldest(tmp_path, fingerprint):
+    disk = svglofi.DiskCache(tmp_path, max_entries=3)
+    for k in range(5):
+        disk.put(k, f'<svg>{k}</svg>')
+    assert [disk.get(k) for k in range(5)] == [None, None, '<svg>2</svg>', '<svg>3</svg>', '<svg>4</svg>']
+    assert sorted(os.listdir(disk.directory)) == sorted(disk.filename(k) for k in (2, 3, 4))
+
+
+def test_stale_directories_removed_foreign_files_kept(tmp_path, fingerprint):
+    stale = tmp_path / f'v{svglofi.RENDERER_VERSION}-{"c" * 16}'
+    stale.mkdir()
+    (stale / f'{"d" * 64}.svg').write_text('<svg/>')
+    (stale / '.tmp-abc').write_text('partial')
+    older = tmp_path / f'v0-{"a" * 16}'
+    older.mkdir()
+    (older / f'{"e" * 64}.svg').write_text('<svg/>')
+    # Not named like a cache directory, or not written by the cache
+    (tmp_path / 'notes.txt').write_text('keep')
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'logo.svg').write_text('<svg/>')
+    mixed = tmp_path / f'v{svglofi.RENDERER_VERSION}-{"f" * 16}'
+    mixed.mkdir()
+    (mixed / 'README').write_text('keep')
+    (mixed / f'{"f" * 64}.svg').write_text('<svg/>')
+
+    disk = svglofi.DiskCache(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ['assets', 'notes.txt', mixed.name, os.path.basename(disk.directory)]
+    )
+    assert os.listdir(tmp_path / 'assets') == ['logo.svg']
+    assert os.listdir(mixed) == ['README']
+
+
+def test_memory_misses_fall_through_to_disk(tmp_path, fingerprint):
+    disk = svglofi.DiskCache(tmp_path)
+    render = counting('<svg>daw</svg>')
+    assert svglofi.RenderCache(disk=disk).get_or_render('daw', render) == '<svg>daw</svg>'
+    assert render.calls == 1
+
+    # A fresh memory cache, as in a new process, reads the disk instead of rendering
+    cache = svglofi.RenderCache(disk=svglofi.DiskCache(tmp_path))
+    assert cache.get_or_render('daw', render) == '<svg>daw</svg>'
+    assert render.calls == 1
+    assert cache.disk.stats()['hits'] == 1
+    # and keeps it in memory from then on
+    assert cache.get_or_render('daw', render) == '<svg>daw</svg>'
+    assert cache.disk.stats()['hits'] == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = svglofi.RenderCache(maxsize=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    # Reading a refreshes it, so b is the oldest when d arrives
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D')
+    assert 'b' not in cache
+    assert [key for key in 'abcd' if key in cache] == ['a', 'c', 'd']
+    cache.put('e', 'E')
+    assert 'c' not in cache and len(cache) == 3
+
+
+def test_hit_and_miss_counters():
+    cache = svglofi.RenderCache()
+    render = counting('<svg/>')
+    for _ in range(3):
+        assert cache.get_or_render('welcome', render) == '<svg/>'
+    assert render.calls == 1
+    assert cache.get('nope') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 2, 1)
+    assert stats['hit_rate'] == 0.5
+    cache.clear()
+    assert cache.stats()['hit_rate'] == 0.0 and len(cache) == 0
+
+
+def test_contains_is_not_a_lookup():
+    cache = svglofi.RenderCache(maxsize=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert 'a' in cache and 'z' not in cache
+    assert (cache.hits, cache.misses) == (0, 0)
+    # Nor does it refresh: a is still the next to go
+    cache.put('c', 'C')
+    assert 'a' not in cache
@@ -0,0 +1,51 @@
+"""chart_path: time series fitted to a box as polyline path data"""
+import numpy as np
+import pytest
+
+import svglofi
+
+BOX = (10, 20, 100, 50)
+
+
+def points(d):
+    """(x, y) pairs of a chart path's polyline"""
+    assert d.startswith('M ')
+    return [tuple(map(float, point.split(','))) for point in d[2:].split()]
+
+
+@pytest.mark.parametrize('series', [
+    [],
+    np.empty((0, 2)),
+    [3.0],
+    [[5.0, 3.0]],
+    [np.nan, np.nan, np.nan],
+    [[0, np.nan], [np.nan, 1], [np.inf, 2]],
+    [np.nan, 4.0, np.inf]
+])
+def test_nothing_to_draw(series):
+    assert svglofi.chart_path(series, *BOX) is None
+
+
+def test_constant_series_is_a_level_line():
+    xy = points(svglofi.chart_path([7.0] * 20, *BOX))
+    assert xy[0][0] == 10 and xy[-1][0] == 110
+    assert {y for _, y in xy} == {45}
+
+
+def test_rows_are_sorted_by_time():
+    times = np.linspace(0, 10, 500)
+    rows = np.column_stack([times, np.sin(times)])
+    expected = svglofi.chart_path(rows, *BOX)
+    shuffled = rows[np.random.default_rng(0).permutation(len(rows))]
+    assert svglofi.chart_path(shuffled, *BOX) == expected
+    xs = [x for x, _ in points(expected)]
+    assert xs == sorted(xs)
+
+
+def test_gaps_are_left_out():
+    values = np.sin(np.linspace(0, 10, 200))
+    with_gaps = values.copy()
+    with_gaps[::7] = np.nan
+    rows = np.column_stack([np.arange(200.0), with_gaps])
+    kept = np.column_stack([np.arange(200.0), values])[np.isfinite(with_gaps)]
+    assert svglofi.chart_path(rows, *BOX) == svglofi.chart_path(kept, *BOX)
@@ -0,0 +1,70 @@
+"""minify_svg keeps every screen valid and drawing the same"""
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import svglofi
+
+MODES = [
+    {},
+    {'symbols': True},
+    {'css_classes': True},
+    {'symbols': True, 'css_vars': True, 'theme': 'dark'}
+]
+
+CLIPPED = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><defs>'
+    '<clipPath id="c"><rect x="0" y="0" width="10" height="10" fill="#000000" stroke="#FFFFFF" />'
+    '<rect x="20" y="0" width="10" height="10" fill="#000000" stroke="#FFFFFF" />'
+    '<rect x="40" y="0" width="10" height="10" fill="#000000" stroke="#FFFFFF" /></clipPath></defs>'
+    '<rect x="0" y="0" width="10.04" height="10" fill="#000000" stroke="#FFFFFF" />'
+    '<rect x="20" y="0" width="10" height="10" fill="#000000" stroke="#FFFFFF" />'
+    '<rect x="40" y="0" width="10" height="10" fill="#000000" stroke="#FFFFFF" /></svg>'
+)
+
+
+def texts(tree):
+    return [element.text for element in tree.iter() if element.text and element.text.strip()]
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_screens_stay_valid(mode):
+    wireframes = svglofi.AthleteAppWireframes(backend='string', **mode)
+    for name in wireframes.SPECS:
+        svg = wireframes.render(name, standalone=True)
+        minified = svglofi.minify_svg(svg)
+        tree = ET.fromstring(minified)
+        assert len(minified) < len(svg), name
+        assert texts(tree) == texts(ET.fromstring(svg)), name
+        assert svglofi.minify_svg(minified) == minified, name
+        for clip in tree.iter('{http://www.w3.org/2000/svg}clipPath'):
+            assert not clip.findall('{http://www.w3.org/2000/svg}g'), name
+
+
+def test_clip_paths_are_not_grouped():
+    minified = svglofi.minify_svg(CLIPPED)
+    clip = re.search(r'<clipPath.*?</clipPath>', minified).group()
+    assert '<g' not in clip and clip.count('<rect') == 3
+    # The same shapes outside it are
+    assert minified.count('<g') == 1
+    assert 'width="10"' in minified.split('</defs>')[1]
+
+
+@pytest.mark.parametrize('precision', [-1, 1.5, None])
+def test_bad_precision(precision):
+    with pytest.raises(ValueError, match='Precision'):
+        svglofi.minify_svg(CLIPPED, precision)
+
+
+@pytest.mark.parametrize('command', ['export', 'minify'])
+@pytest.mark.parametrize('value', ['-1', 'two'])
+def test_cli_rejects_bad_precision(command, value, capsys):
+    with pytest.raises(SystemExit) as exit:
+        svglofi.cli([command, '--precision', value])
+    assert exit.value.code == 2
+    assert '--precision' in capsys.readouterr().err
+
+
+def test_precision_zero():
+    assert 'width="10"' in svglofi.minify_svg(CLIPPED, 0)
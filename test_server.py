@@ -0,0 +1,96 @@
+"""ScreenService responses and the HTTP server around it"""
+import gzip
+import http.client
+import threading
+
+import pytest
+
+import svglofi
+
+
+@pytest.fixture(scope='module')
+def service():
+    return svglofi.ScreenService()
+
+
+def test_ok_and_revalidate(service):
+    status, headers, body = service.respond('/screens/welcome.svg', {})
+    assert status == 200
+    assert headers['Content-Type'] == 'image/svg+xml'
+    assert 'Content-Encoding' not in headers
+    assert body.startswith(b'<svg') and int(headers['Content-Length']) == len(body)
+
+    status, again, body = service.respond('/screens/welcome.svg', {'If-None-Match': headers['ETag']})
+    assert (status, body) == (304, b'')
+    assert again['ETag'] == headers['ETag']
+    assert service.respond('/screens/welcome.svg', {'If-None-Match': '*'})[0] == 304
+    assert service.respond('/screens/welcome.svg', {'If-None-Match': '"other"'})[0] == 200
+
+
+def test_gzip_negotiation(service):
+    _, plain, body = service.respond('/screens/daw.svg', {})
+    status, headers, compressed = service.respond('/screens/daw.svg', {'Accept-Encoding': 'br, gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip' and headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(compressed) == body
+    assert headers['ETag'] != plain['ETag']
+
+    for refused in ('gzip;q=0', 'identity', '*;q=0', 'gzip;q=0, *'):
+        assert 'Content-Encoding' not in service.respond('/screens/daw.svg', {'Accept-Encoding': refused})[1], refused
+    assert 'Content-Encoding' in service.respond('/screens/daw.svg', {'Accept-Encoding': '*'})[1]
+
+
+def test_revalidation_is_per_encoding(service):
+    _, plain, _ = service.respond('/screens/welcome.svg', {})
+    # The identity tag doesn't validate the gzip representation, or back
+    status, headers, _ = service.respond(
+        '/screens/welcome.svg', {'Accept-Encoding': 'gzip', 'If-None-Match': plain['ETag']}
+    )
+    assert status == 200 and headers['Content-Encoding'] == 'gzip'
+    status, _, _ = service.respond('/screens/welcome.svg', {'If-None-Match': headers['ETag']})
+    assert status == 200
+
+
+@pytest.mark.parametrize('path', ['/screens/nope.svg', '/screens/welcome.png', '/other'])
+def test_not_found(service, path):
+    assert service.respond(path, {})[0] == 404
+
+
+@pytest.mark.parametrize('query', ['w=abc', 'w=99', 'h=5000', 'theme=neon'])
+def test_bad_request(service, query):
+    status, headers, body = service.respond(f'/screens/welcome.svg?{query}', {})
+    assert status == 400
+    assert headers['Content-Type'].startswith('text/plain') and body
+
+
+def test_sizes_and_themes_differ(service):
+    _, small, _ = service.respond('/screens/welcome.svg?w=320&h=568', {})
+    _, dark, _ = service.respond('/screens/welcome.svg?theme=dark', {})
+    _, default, _ = service.respond('/screens/welcome.svg', {})
+    assert len({small['ETag'], dark['ETag'], default['ETag']}) == 3
+
+
+def test_server_get_and_head():
+    server = svglofi.make_server(port=0, workers=2, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        connection.request('GET', '/screens/welcome.svg')
+        response = connection.getresponse()
+        body = response.read()
+        assert response.status == 200 and body.startswith(b'<svg')
+
+        # Same headers on the same keep-alive connection, no body
+        connection.request('HEAD', '/screens/welcome.svg')
+        response = connection.getresponse()
+        assert response.status == 200
+        assert response.getheader('Content-Length') == str(len(body))
+        assert response.read() == b''
+
+        connection.request('GET', '/screens/welcome.svg', headers={'If-None-Match': response.getheader('ETag')})
+        response = connection.getresponse()
+        assert response.status == 304 and response.read() == b''
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,59 @@
+"""Every backend, output mode and screen size renders the same markup
+
+    python -m pytest -q test_svglofi.py
+"""
+import re
+
+import pytest
+
+import svglofi
+
+MODES = [
+    {},
+    {'symbols': True},
+    {'css_classes': True},
+    {'symbols': True, 'css_vars': True, 'theme': 'dark'}
+]
+
+
+@pytest.mark.parametrize('backend', sorted(set(svglofi.BACKENDS) - {'svgwrite'}))
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('device', sorted(svglofi.DEVICES))
+def test_backends_match_svgwrite(backend, mode, device):
+    width, height = svglofi.DEVICES[device]
+    reference = svglofi.AthleteAppWireframes(screen_width=width, screen_height=height, **mode)
+    wireframes = svglofi.AthleteAppWireframes(backend=backend, screen_width=width, screen_height=height, **mode)
+    for name in svglofi.AthleteAppWireframes.SPECS:
+        assert wireframes.build_screen(name).tostring() == reference.build_screen(name).tostring(), name
+
+
+def test_variants_match_size_by_size():
+    batch = svglofi.render_variants()
+    for device, (width, height) in svglofi.DEVICES.items():
+        wireframes = svglofi.AthleteAppWireframes(backend='string', screen_width=width, screen_height=height)
+        for name in svglofi.AthleteAppWireframes.SPECS:
+            assert batch[device][name] == wireframes.build_screen(name).tostring(), (device, name)
+
+
+def test_create_base_screen_draws_the_frame():
+    for backend in sorted(svglofi.BACKENDS):
+        wireframes = svglofi.AthleteAppWireframes(backend=backend)
+        dwg = wireframes.new_drawing((wireframes.screen_width, wireframes.screen_height))
+        wireframes.add_base_screen(dwg)
+        assert wireframes.create_base_screen('welcome').tostring() == dwg.tostring(), backend
+
+
+@pytest.mark.parametrize('device', sorted(svglofi.DEVICES))
+def test_daw_transport_fits(device):
+    width, height = svglofi.DEVICES[device]
+    wireframes = svglofi.AthleteAppWireframes(backend='string', screen_width=width, screen_height=height)
+    markup = wireframes.build_screen('daw').tostring()
+    circles = [
+        (float(re.search(r' cx="([\d.]+)"', circle)[1]), float(re.search(r' r="([\d.]+)"', circle)[1]))
+        for circle in re.findall(r'<circle [^>]*>', markup)
+    ]
+    assert len(circles) == 4
+    assert all(r <= x <= width - r for x, r in circles)
+    # Evenly spaced with room between them
+    gaps = {round(b[0] - a[0], 3) for a, b in zip(circles, circles[1:])}
+    assert len(gaps) == 1 and gaps.pop() > 2 * circles[0][1]